@@ -0,0 +1,22 @@
+#Protein amino acid composition analysis = Paacman
+#Version 1.0 (released 5/22/2017 by Patrick Erickson)
+
+#Please visit the Paacman Github repository to view the legal license before using
+#Paacman: https://github.com/kay-lab/Paacman
+
+#Paacman can be used as a library as well as from the command line. For example:
+#    import paacman
+#    paacman.compose("MKCLLA")         #AA counts in AAList order
+#    paacman.dipeptides("MKCLLA")      #20x20 di-AA counts (1st AA, 2nd AA)
+#    paacman.kmers("MKCLLA", 3)        #Tripeptide counts, indexed by k-mer code
+#    paacman.analyze("proteins/")      #Names and count matrices of a folder of FASTA files
+#openpyxl is only loaded when an Excel file is written.
+
+from paacman.aminoacids import (AAList, CysLigList, AlaLigList, AspartimideList, PSList,
+                                AllDiPeptideList, DiPeptideColumns)
+from paacman.counting import ProteinRecord, analyzeProtein, countMatrices, occurrences
+from paacman.records import ProteinTable
+from paacman.engine import Analysis, analyze, compose, dipeptides, kmers, readProteins
+from paacman.kmercounts import kmerName, topKmers
+from paacman.motifs import MotifSet, DefaultMotifSets, compileMotifs, readMotifSets
+from paacman.windows import ResidueClasses, compileWindows, windowCounts, worstWindows
@@ -0,0 +1,9 @@
+#Protein amino acid composition analysis = Paacman
+#This allows Paacman to be run with "python -m paacman".
+
+from paacman.cli import main
+
+#The main guard is needed so that the counting processes started by --jobs can import
+#this module without running Paacman again.
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+#Protein amino acid composition analysis = Paacman
+#Amino acid and di-AA lists shared by the rest of Paacman.
+
+#List of canonical amino acids.
+AAList = ["A","C","D","E","F","G","H","I","K","L",
+          "M","N","P","Q","R","S","T","V","W","Y"]
+          
+#List of Cys ligation sites.
+CysLigList = ["AC","CC","DC","EC","FC","GC","HC","IC","KC","LC",
+          	  "MC","NC","PC","QC","RC","SC","TC","VC","WC","YC"]
+          	  
+#List of Ala ligation sites.
+AlaLigList = ["AA","CA","DA","EA","FA","GA","HA","IA","KA","LA",
+              "MA","NA","PA","QA","RA","SA","TA","VA","WA","YA"]
+
+#List of Potential Aspartimides.
+AspartimideList = ["DA","DC","DD","DE","DF","DG","DH","DI","DK","DL",
+          		   "DM","DN","DP","DQ","DR","DS","DT","DV","DW","DY"]
+
+#List of Potential Pseudoprolines
+PSList = ["AS", "AT", "DS", "DT", "ES", "ET", "FS", "FT", "GS", "GT", "HS", "HT",
+		  "IS", "IT", "KS", "KT", "LS", "LT", "MS", "MT", "NS", "NT", "QS", "QT",
+		  "RS", "RT", "VS", "VT", "WS", "WT", "YS", "YT"]
+
+#Creates List of all Possible Di-peptides.
+AllDiPeptideList = []
+for i in AAList:
+	rowList = []
+	for j in AAList:
+		rowList.append(i + j)
+	AllDiPeptideList.append(rowList)
+
+#This allows each amino acid to be found in the di-AA matrix (e.g., "C" = column 1).
+AAIndex = dict((AA, index) for index, AA in enumerate(AAList))
+
+#Column names of the N x 400 di-AA count matrix, in the same order as AllDiPeptideList.
+DiPeptideColumns = [j for i in AllDiPeptideList for j in i]
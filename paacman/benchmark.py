@@ -0,0 +1,217 @@
+#Protein amino acid composition analysis = Paacman
+#Benchmarks Paacman on a synthetic proteome, e.g. "python -m paacman.benchmark --proteins 5000".
+
+import numpy #Needs to be installed by the user!
+import os
+import sys
+import argparse
+import resource
+import shutil
+import tempfile
+import time
+
+from paacman.aminoacids import AAList
+from paacman.fasta import fastaFiles, readProteinSequences
+from paacman.counting import analyzeProteinReference, countProteins
+
+#Non-canonical residues that are mixed into synthetic proteins with --unknown.
+UnknownResidues = ["X", "B", "Z", "U"]
+
+#Number of residues on each line of a synthetic FASTA file, as UniProt writes them.
+FastaLineLength = 60
+
+#This writes one synthetic protein sequence as FASTA lines, with optional lower case
+#letters, stray spaces/tabs and Windows (CRLF) line endings.
+def fastaLines(ProteinRead, random, lowercase=0.0, whitespace=0.0, crlf=False):
+    """Function for breaking a synthetic protein sequence into noisy FASTA lines"""
+    lineEnd = "\r\n" if crlf else "\n"
+    letters = list(ProteinRead)
+    if lowercase > 0:
+        for i in numpy.flatnonzero(random.random_sample(len(letters)) < lowercase):
+            letters[i] = letters[i].lower()
+    if whitespace > 0:
+        for i in numpy.flatnonzero(random.random_sample(len(letters)) < whitespace):
+            letters[i] += random.choice([" ", "\t"])
+    return [("".join(letters[i:i + FastaLineLength])) + lineEnd
+            for i in range(0, len(letters), FastaLineLength)]
+
+#This writes a synthetic proteome into a folder. Protein lengths follow a log-normal
+#distribution around meanLength, and proteinsPerFile proteins are saved in each FASTA file
+#(1 gives a folder of single protein files, as Paacman was first used with).
+def generateProteome(folder, proteins=1000, meanLength=400, lengthSpread=0.5,
+                     proteinsPerFile=1, lowercase=0.0, whitespace=0.0, crlf=False,
+                     unknown=0.0, seed=0):
+    """Function for writing a synthetic proteome of FASTA files into a folder"""
+    random = numpy.random.RandomState(seed)
+    Residues = numpy.array(AAList + UnknownResidues)
+    weights = numpy.array([(1.0 - unknown) / len(AAList)] * len(AAList) +
+                          [unknown / len(UnknownResidues)] * len(UnknownResidues))
+    lengths = random.lognormal(numpy.log(meanLength), lengthSpread, proteins)
+    lineEnd = "\r\n" if crlf else "\n"
+    if not os.path.isdir(folder):
+        os.makedirs(folder)
+
+    outFile = None
+    for proteinNum in range(proteins):
+        if proteinNum % proteinsPerFile == 0:
+            if outFile is not None:
+                outFile.close()
+            outFile = open(os.path.join(folder, "Protein" + str(proteinNum // proteinsPerFile + 1)
+                                        + ".fasta"), "wb")
+        ProteinRead = "".join(random.choice(Residues, max(int(lengths[proteinNum]), 1), p=weights))
+        outFile.write(">sp|SYN" + str(proteinNum + 1) + "|SYNTHETIC Synthetic protein" + lineEnd)
+        outFile.writelines(fastaLines(ProteinRead, random, lowercase, whitespace, crlf))
+    if outFile is not None:
+        outFile.close()
+
+#This finds the most memory Paacman has used so far, counting the processes started by
+#--jobs. Linux reports it in kB.
+def peakMemory():
+    """Function for finding the peak resident memory (MB) of the benchmark"""
+    selfPeak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    childPeak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(selfPeak, childPeak) / 1024.0
+
+#This times one stage of the benchmark and works out its throughput.
+def timeStage(Results, stage, function, proteins, residues):
+    """Function for running and timing one benchmark stage"""
+    start = time.time()
+    result = function()
+    seconds = time.time() - start
+    Results.append({"stage": stage, "seconds": seconds,
+                    "proteins_per_second": proteins / seconds if seconds else None,
+                    "residues_per_second": residues / seconds if seconds else None,
+                    "peak_rss_mb": peakMemory()})
+    return result
+
+#This lists the proteins whose counts differ between two lists of protein records.
+def mismatchedProteins(ProteinRecords, ReferenceRecords):
+    """Function for comparing the counts of two lists of protein records"""
+    return [Record.ProteinName for Record, Reference in zip(ProteinRecords, ReferenceRecords)
+            if not (numpy.array_equal(Record.AACounts, Reference.AACounts) and
+                    numpy.array_equal(Record.DiPeptideMatrix, Reference.DiPeptideMatrix))]
+
+#This runs each benchmark stage on the FASTA files of a folder: parsing, counting with the
+#original occurrences() code, counting with NumPy (and with a process pool when jobs > 1)
+#and writing the Excel file. Every faster backend has to give exactly the same counts as
+#the original code.
+def runBenchmark(folder, jobs=1, reference=True, write=True, writeOnly=False, formulas=True):
+    """Function for benchmarking Paacman on a folder of FASTA files"""
+    Results = []
+    Files = fastaFiles(folder)
+    ProteinSequences = timeStage(Results, "parse", lambda: list(readProteinSequences(Files)),
+                                 0, 0)
+    proteins = len(ProteinSequences)
+    residues = sum(len(ProteinRead) for ProteinName, ProteinRead in ProteinSequences)
+    if Results[0]["seconds"]: #The parse throughput is only known once the files are read.
+        Results[0]["proteins_per_second"] = proteins / Results[0]["seconds"]
+        Results[0]["residues_per_second"] = residues / Results[0]["seconds"]
+
+    Backends = [("count numpy", 1)]
+    if jobs > 1:
+        Backends.append(("count numpy --jobs " + str(jobs), jobs))
+    Mismatches = {}
+    ReferenceRecords = None
+    if reference:
+        ReferenceRecords = timeStage(Results, "count occurrences (reference)",
+                                     lambda: [analyzeProteinReference(ProteinName, ProteinRead)
+                                              for ProteinName, ProteinRead in ProteinSequences],
+                                     proteins, residues)
+    for stage, backendJobs in Backends:
+        ProteinRecords = timeStage(Results, stage,
+                                   lambda: countProteins(ProteinSequences, backendJobs),
+                                   proteins, residues)
+        if ReferenceRecords is not None:
+            Mismatches[stage] = mismatchedProteins(ProteinRecords, ReferenceRecords)
+
+    if write:
+        from paacman.workbook import writeWorkbook
+        outFolder = tempfile.mkdtemp(prefix="paacman_benchmark_")
+        try:
+            timeStage(Results, "write xlsx",
+                      lambda: writeWorkbook(ProteinRecords, os.path.join(outFolder, "benchmark"),
+                                            writeOnly, formulas),
+                      proteins, residues)
+        finally:
+            shutil.rmtree(outFolder)
+    return {"proteins": proteins, "residues": residues, "stages": Results,
+            "mismatches": Mismatches}
+
+#This prints the benchmark results as a table.
+def printBenchmark(Report):
+    """Function for printing the results of a benchmark run"""
+    print str(Report["proteins"]) + " proteins, " + str(Report["residues"]) + " residues"
+    print "%-32s %10s %14s %14s %12s" % ("Stage", "Seconds", "Proteins/s", "Residues/s",
+                                          "Peak RSS MB")
+    for Stage in Report["stages"]:
+        print "%-32s %10.3f %14.0f %14.0f %12.1f" % (Stage["stage"], Stage["seconds"],
+                                                     Stage["proteins_per_second"] or 0,
+                                                     Stage["residues_per_second"] or 0,
+                                                     Stage["peak_rss_mb"])
+    for stage, Mismatched in sorted(Report["mismatches"].items()):
+        if Mismatched:
+            print stage + " differs from occurrences() for " + str(len(Mismatched)) + \
+                  " proteins, e.g. " + ", ".join(Mismatched[:5])
+        else:
+            print stage + " matches occurrences() for every protein."
+
+#This generates a synthetic proteome (or uses an existing folder) and benchmarks it.
+def main():
+    """Function for running the Paacman benchmark from the command line"""
+    parser = argparse.ArgumentParser(
+        description="Benchmark Paacman on a synthetic proteome")
+    parser.add_argument("--folder", metavar="DIR",
+                        help="benchmark the FASTA files in this folder instead of generating "
+                             "a synthetic proteome")
+    parser.add_argument("--keep", metavar="DIR",
+                        help="generate the synthetic proteome into this folder and keep it")
+    parser.add_argument("--proteins", type=int, default=1000, metavar="N",
+                        help="number of synthetic proteins (default: 1000)")
+    parser.add_argument("--mean-length", type=int, default=400, metavar="N",
+                        help="typical length of a synthetic protein (default: 400)")
+    parser.add_argument("--length-spread", type=float, default=0.5, metavar="SIGMA",
+                        help="spread of the log-normal protein lengths (default: 0.5)")
+    parser.add_argument("--per-file", type=int, default=1, metavar="N",
+                        help="proteins saved in each FASTA file (default: 1)")
+    parser.add_argument("--lowercase", type=float, default=0.0, metavar="FRACTION",
+                        help="fraction of residues written in lower case")
+    parser.add_argument("--whitespace", type=float, default=0.0, metavar="FRACTION",
+                        help="fraction of residues followed by a stray space or tab")
+    parser.add_argument("--crlf", action="store_true",
+                        help="write Windows (CRLF) line endings")
+    parser.add_argument("--unknown", type=float, default=0.0, metavar="FRACTION",
+                        help="fraction of non-canonical residues (X, B, Z, U)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="random seed of the synthetic proteome (default: 0)")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N",
+                        help="also time counting with a pool of N processes")
+    parser.add_argument("--no-reference", action="store_true",
+                        help="skip the slow occurrences() reference and its equivalence check")
+    parser.add_argument("--no-write", action="store_true",
+                        help="skip writing the Excel file")
+    parser.add_argument("--write-only", action="store_true",
+                        help="time the write-only Excel file")
+    parser.add_argument("--values", action="store_true",
+                        help="time the Excel file with values instead of formulas")
+    args = parser.parse_args()
+    if args.proteins < 1 or args.per_file < 1 or args.jobs < 1:
+        parser.error("--proteins, --per-file and --jobs must be at least 1")
+
+    folder = args.folder
+    if folder is None:
+        folder = args.keep or tempfile.mkdtemp(prefix="paacman_proteome_")
+        generateProteome(folder, args.proteins, args.mean_length, args.length_spread,
+                         args.per_file, args.lowercase, args.whitespace, args.crlf,
+                         args.unknown, args.seed)
+    try:
+        Report = runBenchmark(folder, args.jobs, not args.no_reference, not args.no_write,
+                              args.write_only, not args.values)
+    finally:
+        if args.folder is None and args.keep is None:
+            shutil.rmtree(folder)
+    printBenchmark(Report)
+    if any(Report["mismatches"].values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#Protein amino acid composition analysis = Paacman
+#The count cache, which lets re-runs skip proteins that were counted before.
+
+import numpy #Needs to be installed by the user!
+import os
+import hashlib
+import zipfile
+
+from paacman.aminoacids import AAList
+from paacman.counting import ProteinRecord, completeProteinRecord, countProteins
+from paacman.records import proteinTable
+from paacman.profiling import countedSequences, stage
+
+#The count cache is saved in the user's folder under this name.
+CacheFileName = ".paacman_cache.npz"
+
+#This is part of every cache key, and has to be changed whenever the way Paacman counts
+#proteins changes, so that counts from an older Paacman are never reused.
+EngineVersion = "2"
+
+#This identifies a protein sequence in the count cache. Proteins with the same normalized
+#sequence share one cache entry, however their files are named.
+def sequenceKey(ProteinRead):
+    """Function for hashing a normalized protein sequence into a cache key"""
+    return hashlib.sha1(EngineVersion + ":" + ProteinRead).hexdigest()
+
+#This loads the count cache into a dictionary of cache key -> (AACounts, DiPeptideMatrix).
+#A missing or unreadable cache file just means that every protein gets counted again.
+def loadCache(cacheFile):
+    """Function for loading the count cache saved by an earlier Paacman run"""
+    if not os.path.isfile(cacheFile):
+        return {}
+    try:
+        with open(cacheFile, "rb") as inFile:
+            cacheArrays = numpy.load(inFile)
+            keys = cacheArrays["keys"].tolist()
+            AAMatrix = cacheArrays["aa_counts"]
+            DiAAMatrix = cacheArrays["dipeptide_counts"]
+    except (IOError, KeyError, ValueError, zipfile.BadZipfile):
+        print "Paacman could not read its count cache, so every protein will be counted."
+        return {}
+    return dict((key, (AAMatrix[i], DiAAMatrix[i].reshape(len(AAList), len(AAList))))
+                for i, key in enumerate(keys))
+
+#This saves the count cache. The cache is written to a temporary file first so that an
+#interrupted run can't leave a half-written cache behind.
+def saveCache(cacheFile, Cache):
+    """Function for saving the count cache into the user's folder"""
+    keys = sorted(Cache)
+    AAMatrix = numpy.zeros((len(keys), len(AAList)), dtype=numpy.uint32)
+    DiAAMatrix = numpy.zeros((len(keys), len(AAList) ** 2), dtype=numpy.uint32)
+    for i, key in enumerate(keys):
+        AAMatrix[i] = Cache[key][0]
+        DiAAMatrix[i] = Cache[key][1].ravel()
+    tempFile = cacheFile + ".tmp"
+    with open(tempFile, "wb") as outFile:
+        numpy.savez(outFile, keys=numpy.array(keys, dtype="S40"), aa_counts=AAMatrix,
+                    dipeptide_counts=DiAAMatrix)
+    if os.path.exists(cacheFile):
+        os.remove(cacheFile)
+    os.rename(tempFile, cacheFile)
+
+#This turns (protein name, sequence) pairs into protein records, but only counts the
+#proteins whose sequences aren't in the count cache yet. Only the AA and di-AA counts are
+#cached, so any k-mers in kmerSizes, motifs of Matcher and window profiles of Windows are
+#counted for cached proteins as well. The cache entry of every protein read is put into
+#UsedCache (which may be Cache itself, to keep every entry).
+def cachedProteins(ProteinSequences, jobs, Cache, UsedCache, kmerSizes=(), Matcher=None,
+                   Windows=None):
+    """Function for reading each protein into a protein table, reusing cached counts"""
+    ProteinRecords = []
+    keys = []
+    Uncounted = []
+    with stage("cache lookup") as Counts:
+        for ProteinName, ProteinRead in countedSequences(Counts, ProteinSequences):
+            key = sequenceKey(ProteinRead)
+            keys.append(key)
+            if key in Cache:
+                Record = ProteinRecord(ProteinName, Cache[key][0], Cache[key][1],
+                                       ProteinLength=len(ProteinRead))
+                ProteinRecords.append(completeProteinRecord(Record, ProteinRead, kmerSizes,
+                                                            Matcher, Windows))
+            else:
+                ProteinRecords.append(None)
+                Uncounted.append((ProteinName, ProteinRead))
+    
+    #Counts the new proteins and puts them in their place among the cached ones.
+    Counted = iter(countProteins(Uncounted, jobs, kmerSizes, Matcher, Windows))
+    ProteinRecords = proteinTable(Record if Record is not None else next(Counted)
+                                  for Record in ProteinRecords)
+    for key, Record in zip(keys, ProteinRecords):
+        UsedCache[key] = (Record.AACounts, Record.DiPeptideMatrix)
+    return ProteinRecords
+
+#This reads proteins with the count cache saved in cacheFile. Cache entries of proteins
+#that weren't read this time are dropped when the cache is saved again.
+def readCachedProteins(ProteinSequences, jobs, cacheFile, kmerSizes=(), Matcher=None,
+                       Windows=None):
+    """Function for reading each protein into a protein record with the count cache file"""
+    with stage("load cache"):
+        Cache = loadCache(cacheFile)
+    UsedCache = {}
+    ProteinRecords = cachedProteins(ProteinSequences, jobs, Cache, UsedCache, kmerSizes,
+                                    Matcher, Windows)
+    if set(UsedCache) != set(Cache):
+        with stage("save cache"):
+            saveCache(cacheFile, UsedCache)
+    return ProteinRecords
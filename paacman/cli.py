@@ -0,0 +1,399 @@
+#Protein amino acid composition analysis = Paacman
+#Running Paacman from the command line.
+
+import os
+import sys
+import argparse
+import ConfigParser
+
+from paacman.engine import readProteins
+from paacman.fasta import fastaFiles, fastaFolders, readProteinSequences
+from paacman.counting import totalRecord
+from paacman.compression import importLzma, splitCompression
+from paacman.cache import CacheFileName
+from paacman.export import OutputFormats, importPyarrow, writeArrays
+from paacman.kmercounts import MaxKmerSize, writeKmerArrays, writeKmerReport
+from paacman.duplicates import writeDuplicateReport
+from paacman.index import writeIndex
+from paacman.shard import ShardModes, parseShard, writeShard
+from paacman.ligation import DefaultMaxSegment, DefaultPlanSettings, writeLigationPlans
+from paacman.motifs import (DefaultMotifMatcher, DefaultMotifSets, compileMotifs, needsScan,
+                            readMotifSets)
+from paacman.windows import (DefaultWindowProfiles, compileWindows, writeWindowArrays,
+                             writeWorstWindows)
+from paacman import profiling
+
+#This runs Paacman on the FASTA files in the user's folder.
+def main():
+    """Function for running Paacman from the command line"""
+    parser = argparse.ArgumentParser(
+        description="Protein amino acid composition analysis (Paacman)")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N",
+                        help="number of processes used to count proteins (default: 1)")
+    parser.add_argument("--values", action="store_true",
+                        help="write totals and percentages as values calculated by Paacman "
+                             "instead of Excel formulas, so the workbook opens instantly")
+    parser.add_argument("--write-only", action="store_true",
+                        help="stream the Excel file to disk row by row, which keeps memory "
+                             "use flat for large folders (titles are not merged)")
+    parser.add_argument("--proteins-per-workbook", type=int, metavar="N",
+                        help="split the Excel file into parts of at most N proteins, along "
+                             "with a summary workbook of the totals (default: split only "
+                             "when a sheet would run past Excel's row limit)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="read, count and write the Excel file at the same time, holding "
+                             "only a few parts of proteins in memory however large the folder "
+                             "is (the Excel file is split into parts as with "
+                             "--proteins-per-workbook)")
+    parser.add_argument("--spill", action="store_true",
+                        help="count the proteins in constant memory, keeping only running "
+                             "totals in memory and the counts of each protein in a spill "
+                             "file, which the Excel file is written from part by part "
+                             "(always in --write-only mode, so that the writing stays flat "
+                             "as well)")
+    parser.add_argument("--shard", metavar="i/N",
+                        help="count only shard i of N of the proteins (e.g., 2/8, to split a "
+                             "run across computers sharing the folder) and save its partial "
+                             "result, which 'python -m paacman.merge' combines into the "
+                             "output files")
+    parser.add_argument("--shard-by", choices=ShardModes, default="files",
+                        help="split the proteins between the shards by FASTA file or by "
+                             "protein (default: files)")
+    parser.add_argument("--recursive", nargs="?", const=".", metavar="DIR",
+                        help="run Paacman on every folder of FASTA files within DIR (the "
+                             "user's folder by default), each as its own group, and compare "
+                             "the groups in DIR")
+    parser.add_argument("--cache", action="store_true",
+                        help="keep a count cache in the folder (" + CacheFileName + ") so "
+                             "that re-runs only count new or changed proteins")
+    parser.add_argument("--format", action="append", choices=OutputFormats,
+                        dest="formats", metavar="FORMAT",
+                        help="output file to write: " + ", ".join(OutputFormats) +
+                             " (default: xlsx; may be given more than once)")
+    parser.add_argument("--motifs", metavar="FILE",
+                        help="read the motif sets of the CPS Di-AA sheet from a config file "
+                             "instead of the ligation site, aspartimide and pseudoproline "
+                             "lists (see motifs.ini)")
+    parser.add_argument("--duplicates", action="store_true",
+                        help="save a CSV report of the groups of proteins that have exactly "
+                             "the same sequence (each sequence is only counted once)")
+    parser.add_argument("--kmer", action="append", type=int, dest="kmerSizes", metavar="K",
+                        help="also count every k-mer of K amino acids (e.g., 3 for "
+                             "tripeptides) and save the counts and a top k-mer report "
+                             "(may be given more than once)")
+    parser.add_argument("--index", action="store_true",
+                        help="also save where every di-AA sequence and motif is found in each "
+                             "protein as a hit index, which can be searched with "
+                             "'python -m paacman.index'")
+    parser.add_argument("--ligation-plan", nargs="?", type=int, const=DefaultMaxSegment,
+                        metavar="MAX",
+                        help="also plan where to cut each protein into segments of at most "
+                             "MAX residues (default: " + str(DefaultMaxSegment) + ") for "
+                             "native chemical ligation at Cys or Ala, avoiding possible "
+                             "aspartimides and favouring pseudoproline sites")
+    parser.add_argument("--top", type=int, default=10, metavar="N",
+                        help="number of k-mers listed for each protein in the top k-mer "
+                             "report (default: 10)")
+    parser.add_argument("--window", type=int, metavar="W",
+                        help="also profile every window of W residues along each protein and "
+                             "save the window counts and the worst windows of each protein")
+    parser.add_argument("--window-profile", action="append", dest="windowProfiles",
+                        metavar="NAME",
+                        help="what to count in each window: a residue class (hydrophobic, "
+                             "aromatic, acidic, basic, charged, polar), the title of a motif "
+                             "set or a string of amino acids (default: hydrophobic, Possible "
+                             "Aspartimides, Possible Pseudoprolines; may be given more than "
+                             "once)")
+    parser.add_argument("--worst", type=int, default=3, metavar="N",
+                        help="number of worst windows listed for each protein and profile "
+                             "(default: 3)")
+    parser.add_argument("--profile", nargs="?", const="", metavar="FILE",
+                        help="time each stage of the run and save the timings as a JSON "
+                             "report (default: 'AA Analysis for <folder> profile.json')")
+    parser.add_argument("--profile-stage", metavar="STAGE",
+                        help="also capture one stage (e.g., count or 'save xlsx') with "
+                             "cProfile, and with tracemalloc when it is installed")
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.proteins_per_workbook is not None and args.proteins_per_workbook < 1:
+        parser.error("--proteins-per-workbook must be at least 1")
+    formats = args.formats = args.formats or ["xlsx"]
+    args.kmerSizes = sorted(set(args.kmerSizes or []))
+    if any(k < 1 or k > MaxKmerSize for k in args.kmerSizes):
+        parser.error("--kmer must be between 1 and " + str(MaxKmerSize))
+    if args.window is not None and args.window < 1:
+        parser.error("--window must be at least 1")
+    if args.ligation_plan is not None and args.ligation_plan < 1:
+        parser.error("--ligation-plan must be at least 1")
+    for option, used in [("--pipeline", args.pipeline), ("--spill", args.spill)]:
+        if used and (args.cache or args.duplicates or args.kmerSizes or
+                     args.window is not None or args.recursive is not None or
+                     formats != ["xlsx"]):
+            parser.error(option + " only writes the Excel file, so it can't be used with "
+                         "--cache, --duplicates, --kmer, --window, --recursive or --format")
+    if args.pipeline and args.spill:
+        parser.error("--pipeline and --spill can't be used together")
+    if args.shard is not None:
+        try:
+            args.shard = parseShard(args.shard)
+        except ValueError as error:
+            parser.error(str(error))
+        if (args.pipeline or args.spill or args.cache or args.duplicates or args.kmerSizes or
+                args.window is not None or args.recursive is not None or args.index or
+                args.ligation_plan is not None or args.formats != ["xlsx"]):
+            parser.error("--shard only saves a partial result for 'python -m paacman.merge', "
+                         "so it can't be used with --pipeline, --spill, --cache, --duplicates, "
+                         "--kmer, --window, --recursive, --index, --ligation-plan or --format")
+    MotifSets = DefaultMotifSets
+    Windows = None
+    try:
+        if args.motifs is not None:
+            MotifSets = readMotifSets(args.motifs)
+        if args.window is not None:
+            Windows = compileWindows(args.window, args.windowProfiles or DefaultWindowProfiles,
+                                     DefaultMotifSets + MotifSets)
+        Matcher = DefaultMotifMatcher if args.motifs is None else compileMotifs(MotifSets)
+    except (ValueError, ConfigParser.Error) as error:
+        print error
+        print "Paacman terminated."
+        sys.exit()
+    if "arrow" in formats or "parquet" in formats:
+        try:
+            importPyarrow() #Makes sure pyarrow is installed before any counting is done.
+        except ImportError:
+            print "Arrow and Parquet files need the pyarrow library to be installed."
+            print "Please install pyarrow, or save the counts as npz or npy files instead."
+            print "Paacman terminated."
+            sys.exit()
+    
+    #Finds the FASTA files in the user's folder (or in each folder of the tree with
+    #--recursive). xz files can only be read with lzma.
+    if args.recursive is not None:
+        Folders = fastaFolders(args.recursive)
+    else:
+        Folders = ["."]
+    Files = [File for folder in Folders for File in fastaFiles(folder)]
+    if any(splitCompression(File)[1] == "xz" for File in Files):
+        try:
+            importLzma() #Makes sure xz files can be read before any counting is done.
+        except ImportError:
+            print "xz compressed FASTA files need the backports.lzma library on Python 2.7."
+            print "Please install backports.lzma, or compress the files with gzip or bz2."
+            print "Paacman terminated."
+            sys.exit()
+    
+    if args.profile is not None or args.profile_stage is not None:
+        profiling.startProfiling(hotStage=args.profile_stage)
+    
+    #Intro to the user.
+    print "Welcome to Paacman! Starting amino acid composition analysis..."
+    print ""
+    
+    if args.recursive is not None:
+        outName = runGroups(Folders, args, Matcher, Windows)
+    elif args.shard is not None:
+        #Counts only this shard's share of the proteins in the user's folder.
+        outName = outputName(".")
+        shardFile = writeShard(Files, outName, args.shard[0], args.shard[1], args.shard_by,
+                               args.jobs, Matcher, Matcher if needsScan(Matcher) else None)
+        print "Shard " + str(args.shard[0]) + " of " + str(args.shard[1]) + \
+              " saved to " + shardFile + "."
+        print ""
+    elif args.pipeline:
+        #Reads, counts and writes the proteins in the user's folder at the same time.
+        from paacman.pipeline import writePipeline
+        outName = outputName(".")
+        outFiles = writePipeline(Files, outName, args.jobs, args.write_only, not args.values,
+                                 Matcher, args.proteins_per_workbook,
+                                 Matcher if needsScan(Matcher) else None)
+        if not outFiles:
+            noFastaFiles()
+        reportParts(outFiles)
+        writeSequenceOutputs(Files, outName, args, Matcher, args.jobs)
+    elif args.spill:
+        #Counts the proteins in the user's folder into a spill file, then writes from it.
+        from paacman.spill import writeSpilled
+        outName = outputName(".")
+        outFiles = writeSpilled(Files, outName, args.jobs, not args.values, Matcher,
+                                args.proteins_per_workbook,
+                                Matcher if needsScan(Matcher) else None)
+        if not outFiles:
+            noFastaFiles()
+        reportParts(outFiles)
+        writeSequenceOutputs(Files, outName, args, Matcher, args.jobs)
+    else:
+        #Reads every protein in the user's folder once.
+        ProteinRecords, Duplicates = readFolder(".", args, Matcher, Windows, args.jobs, Files)
+        
+        #This makes sure that the user has FASTA files within their folder.
+        if not ProteinRecords:
+            noFastaFiles()
+        
+        outName = outputName(".")
+        writeOutputs(ProteinRecords, outName, args, Matcher, Windows, Duplicates, args.jobs,
+                     Files)
+    
+    #Saves where the time of the run went.
+    if profiling.Stages is not None:
+        Report = profiling.stopProfiling()
+        profileFile = args.profile or outName + " profile.json"
+        profiling.writeProfile(Report, profileFile)
+        profiling.printProfile(Report)
+        print "Profile saved to " + profileFile
+        print ""
+    
+    #Concluding message to the user.
+    print "Paacman has finished!"
+
+#This tells the user that there are no FASTA files to count, and stops Paacman.
+def noFastaFiles():
+    """Function for stopping Paacman when the user's folder has no FASTA files"""
+    print "There appears to be no FASTA files in your folder!"
+    print "Please make sure that your FASTA files are saved as .txt, .fasta or .fa files."
+    print "Paacman terminated"
+    sys.exit()
+
+#This tells the user where the Excel output went when it was split into parts.
+def reportParts(outFiles):
+    """Function for listing the parts of a split Excel output"""
+    if len(outFiles) > 1:
+        print "The Excel output was split into " + str(len(outFiles) - 1) + " parts, " + \
+              "with the totals in " + outFiles[-1] + "."
+        print ""
+
+#Output files are named based on the folder they're written for, and saved in it.
+def outputName(folder):
+    """Function for naming the output files of a folder"""
+    outName = "AA Analysis for " + os.path.basename(os.path.abspath(folder))
+    if folder == ".":
+        return outName
+    return os.path.join(folder, outName)
+
+#This reads every protein of a folder once, with the folder's own count cache.
+def readFolder(folder, args, Matcher, Windows, jobs, Files=None):
+    """Function for reading the proteins of a folder with the command line options"""
+    if Files is None:
+        Files = fastaFiles(folder)
+    Duplicates = []
+    ProteinRecords = readProteins(jobs,
+                                  os.path.join(folder, CacheFileName) if args.cache else None,
+                                  Files, kmerSizes=args.kmerSizes,
+                                  Matcher=Matcher if needsScan(Matcher) else None,
+                                  Windows=Windows, Duplicates=Duplicates)
+    return ProteinRecords, Duplicates
+
+#This writes every output file asked for on the command line for a folder's proteins. The
+#hit index and ligation plans are built by reading Files again, when they are given.
+def writeOutputs(ProteinRecords, outName, args, Matcher, Windows, Duplicates, jobs=1,
+                 Files=None):
+    """Function for writing the output files of a list of protein records"""
+    formats = args.formats
+    
+    #Creates the output Excel file, which is split into parts when the proteins don't fit
+    #into one. openpyxl is only loaded when an Excel file is written.
+    if "xlsx" in formats:
+        from paacman.workbook import writeWorkbooks
+        reportParts(writeWorkbooks(ProteinRecords, outName, args.write_only, not args.values,
+                                   Matcher, jobs, args.proteins_per_workbook))
+    
+    #Saves the counts as array files.
+    for outputFormat in formats:
+        if outputFormat != "xlsx":
+            writeArrays(ProteinRecords, outName, outputFormat)
+    
+    #Lists the proteins that have the same sequence as another protein.
+    if args.duplicates and Duplicates is not None:
+        with profiling.stage("write duplicates", len(ProteinRecords)):
+            writeDuplicateReport(Duplicates, outName + " duplicates.csv")
+    
+    #Saves the k-mer counts and the most common k-mers of each protein. Totalled records
+    #(e.g., of each group with --recursive) have no k-mer counts or window profiles.
+    if ProteinRecords[0].KmerCounts is not None:
+        for k in args.kmerSizes:
+            with profiling.stage("write " + str(k) + "-mers", len(ProteinRecords)):
+                writeKmerReport(ProteinRecords, k, args.top,
+                                outName + " " + str(k) + "-mers.csv")
+                writeKmerArrays(ProteinRecords, k, outName + " " + str(k) + "-mers.npz")
+    
+    #Saves the window profiles and the worst windows of each protein.
+    if ProteinRecords[0].WindowCounts is not None:
+        with profiling.stage("write windows", len(ProteinRecords)):
+            writeWindowArrays(ProteinRecords, Windows, outName + " windows.npz")
+            writeWorstWindows(ProteinRecords, Windows, args.worst,
+                              outName + " worst windows.csv")
+    
+    if Files is not None:
+        writeSequenceOutputs(Files, outName, args, Matcher, jobs)
+
+#This writes the output files that are built from the sequences rather than the counts, by
+#reading the FASTA files again.
+def writeSequenceOutputs(Files, outName, args, Matcher, jobs=1):
+    """Function for writing the output files built from the protein sequences"""
+    #Saves where every di-AA sequence and motif is found in each protein.
+    if args.index:
+        writeIndex(readProteinSequences(Files), Matcher, outName + " index.npz")
+    
+    #Saves where each protein could be cut into segments for native chemical ligation.
+    if args.ligation_plan is not None:
+        writeLigationPlans(readProteinSequences(Files), outName + " ligation plan.csv",
+                           DefaultPlanSettings._replace(MaxSegment=args.ligation_plan), jobs)
+
+#This counts the proteins of one group folder, writes the group's usual output files into it
+#and returns the group's totals as a single protein record named after the group. It takes
+#a single tuple so that it can be handed out to a pool of processes.
+def runGroup(Arguments):
+    """Function for counting one group folder and writing its output files"""
+    folder, groupName, args, Matcher, Windows, jobs = Arguments
+    Files = fastaFiles(folder)
+    ProteinRecords, Duplicates = readFolder(folder, args, Matcher, Windows, jobs, Files)
+    if ProteinRecords:
+        writeOutputs(ProteinRecords, outputName(folder), args, Matcher, Windows, Duplicates,
+                     jobs, Files)
+    return totalRecord(groupName, ProteinRecords), len(ProteinRecords)
+
+#This runs Paacman on each folder of FASTA files in a folder tree (each folder is a group of
+#proteins), then merges the totals of every group into a comparison of the groups, saved in
+#the top folder with a row per group and the totals of every protein in the tree. With more
+#than 1 job, the groups are counted by a pool of processes, each counting a whole group.
+def runGroups(Folders, args, Matcher, Windows):
+    """Function for running Paacman on every group folder of a folder tree"""
+    if not Folders:
+        print "There appears to be no FASTA files in any folder of " + args.recursive + "!"
+        print "Please make sure that your FASTA files are saved as .txt, .fasta or .fa files."
+        print "Paacman terminated"
+        sys.exit()
+    root = args.recursive
+    Groups = []
+    for folder in Folders:
+        groupName = os.path.relpath(folder, root)
+        if groupName == ".":
+            groupName = os.path.basename(os.path.abspath(root))
+        Groups.append((folder, groupName))
+    
+    with profiling.stage("count groups") as Counts:
+        if args.jobs > 1 and len(Groups) > 1:
+            import multiprocessing #Only needed when counting with more than 1 process.
+            pool = multiprocessing.Pool(min(args.jobs, len(Groups)))
+            try:
+                GroupTotals = pool.map(runGroup, [(folder, groupName, args, Matcher, Windows, 1)
+                                                  for folder, groupName in Groups],
+                                       chunksize=1)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            GroupTotals = [runGroup((folder, groupName, args, Matcher, Windows, args.jobs))
+                           for folder, groupName in Groups]
+        Counts["proteins"] = sum(proteins for Record, proteins in GroupTotals)
+    for (folder, groupName), (Record, proteins) in zip(Groups, GroupTotals):
+        print groupName + ": " + str(proteins) + " proteins"
+    print ""
+    
+    #Saves the comparison of the groups, whose "Total" rows are the totals of every group.
+    outName = outputName(root) + " groups"
+    writeOutputs([Record for Record, proteins in GroupTotals], outName, args, Matcher, None,
+                 None, args.jobs)
+    print "The groups are compared in the " + outName + " output files."
+    print ""
+    return outName
@@ -0,0 +1,114 @@
+#Protein amino acid composition analysis = Paacman
+#Reading gzip, bz2 and xz compressed FASTA files as a stream, without temporary files.
+
+from contextlib import contextmanager
+import zlib
+import bz2
+
+#Compressed FASTA files are found in the user's folder by these extensions (e.g.,
+#Protein1.fasta.gz), and any file is read as compressed when it starts with these bytes.
+CompressedExtensions = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+MagicBytes = [("\x1f\x8b", "gzip"), ("BZh", "bz2"), ("\xfd7zXZ\x00", "xz")]
+MagicLength = max(len(magic) for magic, compression in MagicBytes)
+CompressionMagic = dict((compression, magic) for magic, compression in MagicBytes)
+
+#Compressed files are read and decompressed this many bytes at a time, so that only one
+#chunk (and the line it ends in) is ever held in memory.
+DecompressChunkSize = 1 << 16
+
+#xz files need the lzma module, which Python 2.7 only has through the backports.lzma
+#library. It is only imported when an xz file is read.
+def importLzma():
+    """Function for importing lzma (or backports.lzma), raising ImportError if missing"""
+    try:
+        import lzma
+    except ImportError:
+        from backports import lzma
+    return lzma
+
+#This makes a new decompressor for a compression format. gzip files are read by zlib
+#(16 + MAX_WBITS tells zlib to expect a gzip header).
+def newDecompressor(compression):
+    """Function for making a decompressor for gzip, bz2 or xz data"""
+    if compression == "gzip":
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if compression == "bz2":
+        return bz2.BZ2Decompressor()
+    return importLzma().LZMADecompressor()
+
+#This splits a compression extension (e.g., .gz) off of a file name.
+def splitCompression(File):
+    """Function for splitting a file name into its uncompressed name and compression"""
+    for extension, compression in CompressedExtensions.items():
+        if File.endswith(extension):
+            return File[:-len(extension)], compression
+    return File, None
+
+#This finds whether the first bytes of a file are those of a compressed file.
+def compressionOf(magic):
+    """Function for finding the compression of a file from its first bytes"""
+    for magicBytes, compression in MagicBytes:
+        if magic.startswith(magicBytes):
+            return compression
+    return None
+
+#This decompresses a file one chunk at a time. Files made of several compressed streams
+#(e.g., by pigz, pbzip2 or cat) are read to the end of the last stream. Anything after a
+#stream that doesn't start another one (e.g., zero padding left by a tape or block copy) is
+#ignored, as gzip itself does.
+def decompressedChunks(inFile, compression):
+    """Generator for the decompressed chunks of a compressed file"""
+    magic = CompressionMagic[compression]
+    decompressor = newDecompressor(compression)
+    data = ""
+    while True:
+        if not data:
+            data = inFile.read(DecompressChunkSize)
+            if not data:
+                break
+        try:
+            chunk = decompressor.decompress(data)
+        except EOFError: #The last stream ended right at the end of the previous chunk.
+            streamEnded = True
+        else:
+            yield chunk
+            data = decompressor.unused_data
+            streamEnded = bool(data)
+        if streamEnded:
+            while len(data) < len(magic) and magic.startswith(data):
+                more = inFile.read(len(magic) - len(data))
+                if not more:
+                    break
+                data += more
+            if not data.startswith(magic):
+                return
+            decompressor = newDecompressor(compression)
+    if compression == "gzip":
+        yield decompressor.flush()
+
+#This splits decompressed chunks into lines, accepting \n, \r\n and \r line endings just as
+#FASTA files that aren't compressed are read.
+def decompressedLines(inFile, compression):
+    """Generator for the lines of a compressed file"""
+    rest = ""
+    for chunk in decompressedChunks(inFile, compression):
+        Lines = (rest + chunk).splitlines(True)
+        rest = Lines.pop() if Lines else ""
+        for line in Lines:
+            yield line
+    if rest:
+        yield rest
+
+#This opens a FASTA file, compressed or not, for reading line by line in a with statement.
+#The file's first bytes decide whether it is decompressed, whatever its extension.
+@contextmanager
+def openFasta(File):
+    """Context manager for reading the lines of a FASTA file"""
+    with open(File, 'U') as inFile: #U allows any .txt format to be accepted.
+        compression = compressionOf(inFile.read(MagicLength))
+        if compression is None:
+            inFile.seek(0)
+            yield inFile
+            return
+    with open(File, 'rb') as inFile:
+        yield decompressedLines(inFile, compression)
@@ -0,0 +1,169 @@
+#Protein amino acid composition analysis = Paacman
+#Counting the amino acids and di-AA sequences of proteins with NumPy.
+
+import numpy #Needs to be installed by the user!
+from functools import partial
+
+from paacman.aminoacids import AAList, AAIndex, AllDiPeptideList
+from paacman.kmercounts import kmerCounts
+from paacman.motifs import scanMotifs
+from paacman.windows import windowCounts
+from paacman.records import ProteinRecord, ProteinTable, proteinTable
+from paacman.profiling import countedSequences, stage
+
+#This allows overlapping di-AA sequences (e.g., EEE = 2 EE's) to be counted correctly.
+#Paacman now counts di-AA sequences with diPeptideMatrix(); this is kept as the reference
+#that diPeptideMatrix() has to agree with.
+def occurrences(string, sub):
+	"""Function for counting the number of di-AA sequences that overlap (e.g., AAA)"""
+	count = start = 0
+	while True:
+		start = string.find(sub, start) + 1
+		if start > 0:
+			count+=1
+		else:
+			return count
+
+#This turns each letter of a protein into its position in AAList so that proteins can be
+#counted with NumPy. Anything that isn't a canonical amino acid (e.g., X or B) becomes 20.
+AAEncoding = numpy.full(256, len(AAList), dtype=numpy.uint8)
+for AA in AAList:
+	AAEncoding[ord(AA)] = AAIndex[AA]
+
+#Number of proteins sent to a counting process at a time when running with --jobs.
+ProteinChunkSize = 64
+
+#This counts a protein the way Paacman originally did: each amino acid with a string count
+#and each di-AA sequence with occurrences(). It is far slower than analyzeProtein(), and is
+#only used to check that analyzeProtein() still gives exactly the same counts.
+def analyzeProteinReference(ProteinName, ProteinRead):
+    """Function for building a protein record with the original string counting"""
+    AACounts = numpy.array([ProteinRead.count(AA) for AA in AAList], dtype=numpy.uint32)
+    DiAAMatrix = numpy.array([[occurrences(ProteinRead, j) for j in i]
+                              for i in AllDiPeptideList], dtype=numpy.uint32)
+    return ProteinRecord(ProteinName, AACounts, DiAAMatrix)
+
+#This encodes a normalized protein sequence as a NumPy array of AAList positions.
+def encodeProtein(ProteinRead):
+    """Function for turning a protein sequence into a uint8 array of AAList positions"""
+    return AAEncoding[numpy.frombuffer(ProteinRead, dtype=numpy.uint8)]
+
+#This counts every overlapping di-AA sequence (e.g., EEE = 2 EE's) in a single pass, as the
+#k = 2 case of the k-mer counts. Pairs containing a non-canonical residue are dropped,
+#which matches what occurrences() finds for every entry in AllDiPeptideList.
+def diPeptideMatrix(EncodedProtein):
+    """Function for counting all 400 di-AA sequences of an encoded protein"""
+    return kmerCounts(EncodedProtein, 2).reshape(len(AAList), len(AAList))
+
+#This counts every canonical amino acid of an encoded protein in AAList order. Anything
+#that isn't a canonical amino acid is counted as a 21st entry and then dropped.
+def aaCounts(EncodedProtein):
+    """Function for counting the 20 canonical amino acids of an encoded protein"""
+    return numpy.bincount(EncodedProtein, minlength=len(AAList) + 1)[:-1]
+
+#This counts the k-mers of each size in kmerSizes (e.g., (3, 4) for tri- and tetrapeptides)
+#of an encoded protein, or gives None when no k-mers were asked for.
+def kmerCountsBySize(EncodedProtein, kmerSizes):
+    """Function for counting the k-mers of several sizes of an encoded protein"""
+    if not kmerSizes:
+        return None
+    return dict((k, kmerCounts(EncodedProtein, k)) for k in kmerSizes)
+
+#This counts the motifs of a motif matcher in an encoded protein, or gives None when there
+#is no matcher to scan for.
+def motifCountsOrNone(EncodedProtein, Matcher):
+    """Function for scanning an encoded protein for the motifs of a matcher"""
+    if Matcher is None:
+        return None
+    return scanMotifs(EncodedProtein, Matcher)
+
+#This counts the sliding-window profiles of an encoded protein, or gives None when no
+#window settings were given.
+def windowCountsOrNone(EncodedProtein, Windows):
+    """Function for building the window profiles of an encoded protein"""
+    if Windows is None:
+        return None
+    return windowCounts(EncodedProtein, Windows)
+
+#This counts the single amino acids and every di-AA sequence within a protein, along with
+#the k-mers of each size in kmerSizes, the motifs of Matcher and the window profiles of
+#Windows.
+def analyzeProtein(ProteinName, ProteinRead, kmerSizes=(), Matcher=None, Windows=None):
+    """Function for building a protein record from a normalized protein sequence"""
+    EncodedProtein = encodeProtein(ProteinRead)
+    return ProteinRecord(ProteinName, aaCounts(EncodedProtein).astype(numpy.uint32),
+                         diPeptideMatrix(EncodedProtein),
+                         kmerCountsBySize(EncodedProtein, kmerSizes),
+                         motifCountsOrNone(EncodedProtein, Matcher),
+                         windowCountsOrNone(EncodedProtein, Windows), len(EncodedProtein))
+
+#This adds the k-mer counts, motif counts and window profiles to a protein record whose AA
+#and di-AA counts are already known (e.g., from the count cache).
+def completeProteinRecord(Record, ProteinRead, kmerSizes=(), Matcher=None, Windows=None):
+    """Function for adding k-mer counts, motif counts and window profiles to a record"""
+    if not kmerSizes and Matcher is None and Windows is None:
+        return Record
+    EncodedProtein = encodeProtein(ProteinRead)
+    return Record._replace(KmerCounts=kmerCountsBySize(EncodedProtein, kmerSizes),
+                           MotifCounts=motifCountsOrNone(EncodedProtein, Matcher),
+                           WindowCounts=windowCountsOrNone(EncodedProtein, Windows))
+
+#This allows analyzeProtein() to be handed out to the counting processes of --jobs, which
+#pass a single (protein name, sequence) pair.
+def analyzeProteinSequence(ProteinSequence, kmerSizes=(), Matcher=None, Windows=None):
+    """Function for building a protein record from a (protein name, sequence) pair"""
+    return analyzeProtein(ProteinSequence[0], ProteinSequence[1], kmerSizes, Matcher, Windows)
+
+#This counts a list of (protein name, sequence) pairs in order into a protein table. With
+#more than 1 job, the counting is handed out to a pool of processes in chunks of proteins,
+#while the records are still added in the same order as the proteins.
+def countProteins(ProteinSequences, jobs=1, kmerSizes=(), Matcher=None, Windows=None):
+    """Function for turning (protein name, sequence) pairs into a protein table"""
+    ProteinRecords = ProteinTable()
+    with stage("count") as Counts:
+        ProteinSequences = countedSequences(Counts, ProteinSequences)
+        if jobs > 1:
+            import multiprocessing #Only needed when counting with more than 1 process.
+            pool = multiprocessing.Pool(jobs)
+            try:
+                for Record in pool.imap(partial(analyzeProteinSequence, kmerSizes=kmerSizes,
+                                                Matcher=Matcher, Windows=Windows),
+                                        ProteinSequences, chunksize=ProteinChunkSize):
+                    ProteinRecords.append(Record)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            for ProteinName, ProteinRead in ProteinSequences:
+                ProteinRecords.append(analyzeProtein(ProteinName, ProteinRead, kmerSizes,
+                                                     Matcher, Windows))
+    return ProteinRecords
+
+#This adds up count arrays (e.g., the AACounts of every protein record) into one array.
+def sumCounts(CountArrays, shape):
+    """Function for totalling count arrays of the same shape"""
+    total = numpy.zeros(shape, dtype=numpy.int64)
+    for counts in CountArrays:
+        total += counts
+    return total
+
+#This totals protein records (e.g., a protein table, or the records of a group of proteins)
+#into a single record, whose motif counts are totalled too when the records have any.
+def totalRecord(ProteinName, ProteinRecords):
+    """Function for totalling protein records into one record"""
+    MotifCounts = None
+    if ProteinRecords and ProteinRecords[0].MotifCounts is not None:
+        MotifCounts = sumCounts((Record.MotifCounts for Record in ProteinRecords),
+                                len(ProteinRecords[0].MotifCounts))
+    AAMatrix, DiAAMatrix = countMatrices(ProteinRecords)
+    return ProteinRecord(ProteinName, AAMatrix.sum(axis=0, dtype=numpy.int64),
+                         DiAAMatrix.sum(axis=0, dtype=numpy.int64).reshape(len(AAList),
+                                                                          len(AAList)),
+                         MotifCounts=MotifCounts)
+
+#This gives the counts of every protein as an N x 20 AA count matrix and an N x 400 di-AA
+#count matrix, whose columns are in the same order as AAList and DiPeptideColumns. A
+#protein table already holds them, so they are only stacked for other lists of records.
+def countMatrices(ProteinRecords):
+    """Function for building the AA and di-AA count matrices of protein records"""
+    return proteinTable(ProteinRecords).countMatrices()
@@ -0,0 +1,52 @@
+#Protein amino acid composition analysis = Paacman
+#Counting each distinct protein sequence once, however many proteins share it.
+
+import hashlib
+import csv
+
+from paacman.records import proteinTable
+
+#This passes on the first protein of each distinct sequence, so that isoforms and copies of
+#a protein in several files are only counted once. For every protein read, its name and the
+#number of its sequence among the distinct ones are added to SequenceNumbers. Sequences are
+#kept apart by their MD5 hash, so that only 16 bytes are held for each of them (MD5 is only
+#used to tell sequences apart, and hashes proteins about twice as fast as SHA-1).
+def uniqueSequences(ProteinSequences, SequenceNumbers):
+    """Generator for the first (protein name, sequence) pair of each distinct sequence"""
+    Seen = {}
+    for ProteinName, ProteinRead in ProteinSequences:
+        key = hashlib.md5(ProteinRead).digest()
+        if key not in Seen:
+            Seen[key] = len(Seen)
+            yield ProteinName, ProteinRead
+        SequenceNumbers.append((ProteinName, Seen[key]))
+
+#This hands the record of each distinct sequence out to every protein that shares it, in
+#the order the proteins were read, as a protein table. When no sequence was shared, the
+#table of distinct proteins is already the answer and nothing is copied.
+def sharedRecords(ProteinRecords, SequenceNumbers):
+    """Function for giving each protein the record of its sequence"""
+    ProteinRecords = proteinTable(ProteinRecords)
+    if len(SequenceNumbers) == len(ProteinRecords):
+        return ProteinRecords
+    return ProteinRecords.take([sequenceNum for ProteinName, sequenceNum in SequenceNumbers],
+                               [ProteinName for ProteinName, sequenceNum in SequenceNumbers])
+
+#This lists the names of each group of proteins that share a sequence, in the order their
+#first proteins were read.
+def duplicateGroups(SequenceNumbers):
+    """Function for grouping the names of proteins with the same sequence"""
+    Groups = {}
+    for ProteinName, sequenceNum in SequenceNumbers:
+        Groups.setdefault(sequenceNum, []).append(ProteinName)
+    return [Groups[sequenceNum] for sequenceNum in sorted(Groups) if len(Groups[sequenceNum]) > 1]
+
+#This saves the groups of proteins that share a sequence as a CSV file, one protein per row.
+def writeDuplicateReport(Groups, fileName):
+    """Function for saving the groups of proteins with the same sequence as a CSV file"""
+    with open(fileName, "wb") as outFile:
+        writer = csv.writer(outFile)
+        writer.writerow(["Group", "Proteins in Group", "Protein Name"])
+        for groupNum, ProteinNames in enumerate(Groups):
+            for ProteinName in ProteinNames:
+                writer.writerow([groupNum + 1, len(ProteinNames), ProteinName])
@@ -0,0 +1,75 @@
+#Protein amino acid composition analysis = Paacman
+#The library side of Paacman: counting proteins without writing any output files.
+
+import numpy #Needs to be installed by the user!
+from collections import namedtuple
+import os
+
+from paacman.fasta import fastaFiles, normalizeProtein, readProteinSequences
+from paacman.counting import (aaCounts, countMatrices, countProteins, diPeptideMatrix,
+                              encodeProtein)
+from paacman.kmercounts import kmerCounts
+from paacman.cache import readCachedProteins
+from paacman.duplicates import duplicateGroups, sharedRecords, uniqueSequences
+from paacman.profiling import timedSequences
+
+#This holds the counts of a group of proteins as arrays. AACounts is an N x 20 matrix in
+#AAList order and DiPeptideCounts is an N x 400 matrix in DiPeptideColumns order.
+Analysis = namedtuple("Analysis", ["ProteinNames", "AACounts", "DiPeptideCounts"])
+
+#This reads every protein in a list of FASTA files (the user's folder by default) exactly
+#once, optionally reusing the counts saved in the count cache, counting the k-mers of each
+#size in kmerSizes, scanning for the motifs of a motif matcher and building the window
+#profiles of Windows. Proteins with the same sequence are only counted once. When a list is
+#given as Duplicates, the names of each group of proteins sharing a sequence are added to it.
+def readProteins(jobs=1, cacheFile=None, Files=None, kmerSizes=(), Matcher=None,
+                 Windows=None, Duplicates=None):
+    """Function for reading each protein in the FASTA files into a protein record"""
+    ProteinSequences = timedSequences("read FASTA", readProteinSequences(Files))
+    SequenceNumbers = []
+    ProteinSequences = uniqueSequences(ProteinSequences, SequenceNumbers)
+    if cacheFile is not None:
+        ProteinRecords = readCachedProteins(ProteinSequences, jobs, cacheFile, kmerSizes,
+                                            Matcher, Windows)
+    else:
+        ProteinRecords = countProteins(ProteinSequences, jobs, kmerSizes, Matcher, Windows)
+    if Duplicates is not None:
+        Duplicates.extend(duplicateGroups(SequenceNumbers))
+    return sharedRecords(ProteinRecords, SequenceNumbers)
+
+#This counts the 20 canonical amino acids of a single protein sequence in AAList order.
+#Line breaks, spaces and lower case letters are allowed, as in a FASTA file.
+def compose(ProteinRead):
+    """Function for counting the amino acids of a protein sequence"""
+    return aaCounts(encodeProtein(normalizeProtein(str(ProteinRead)))).astype(numpy.uint32)
+
+#This counts all 400 di-AA sequences of a single protein sequence. The result is laid out
+#like AllDiPeptideList (result[1st AA, 2nd AA]).
+def dipeptides(ProteinRead):
+    """Function for counting the di-AA sequences of a protein sequence"""
+    EncodedProtein = encodeProtein(normalizeProtein(str(ProteinRead)))
+    return diPeptideMatrix(EncodedProtein).astype(numpy.uint32)
+
+#This counts every k-mer of a single protein sequence (e.g., k = 3 for tripeptides). k-mers
+#with up to 8,000 possible sequences come back as a dense array indexed by k-mer code, and
+#longer ones as sparse (k-mer codes, counts) arrays; kmerName() turns a code into
+#its amino acids.
+def kmers(ProteinRead, k):
+    """Function for counting the k-mers of a protein sequence"""
+    return kmerCounts(encodeProtein(normalizeProtein(str(ProteinRead))), k)
+
+#This counts every protein in one or more FASTA files or folders of FASTA files, in the
+#same order that Paacman writes them into the Excel file.
+def analyze(paths, jobs=1, cacheFile=None):
+    """Function for counting the proteins of FASTA files and folders into arrays"""
+    if isinstance(paths, basestring):
+        paths = [paths]
+    Files = []
+    for path in paths:
+        if os.path.isdir(path):
+            Files += fastaFiles(path)
+        else:
+            Files.append(path)
+    ProteinRecords = readProteins(jobs, cacheFile, Files)
+    AAMatrix, DiAAMatrix = countMatrices(ProteinRecords)
+    return Analysis([Record.ProteinName for Record in ProteinRecords], AAMatrix, DiAAMatrix)
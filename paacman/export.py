@@ -0,0 +1,63 @@
+#Protein amino acid composition analysis = Paacman
+#Saving the count matrices as array files for NumPy/pandas.
+
+import numpy #Needs to be installed by the user!
+import os
+
+from paacman.aminoacids import AAList, DiPeptideColumns
+from paacman.counting import countMatrices
+from paacman.profiling import stage
+
+#Output files that Paacman can write. Besides the Excel file, the counts can be saved as
+#array files for NumPy/pandas: an .npz file, a folder of .npy files (which can be
+#memory-mapped with numpy.load(mmap_mode="r")), an Arrow IPC file (which can be
+#memory-mapped with pyarrow.memory_map) or a Parquet file.
+OutputFormats = ["xlsx", "npz", "npy", "arrow", "parquet"]
+
+#pyarrow is only needed for Arrow and Parquet files, so it is only imported for them.
+def importPyarrow():
+    """Function for importing pyarrow, which Arrow and Parquet files need"""
+    import pyarrow
+    import pyarrow.parquet
+    return pyarrow
+
+#This saves the protein names, AA counts and di-AA counts as array files. outName is the
+#output file name without its extension.
+def saveArrays(ProteinRecords, outName, outputFormat):
+    """Function for saving the count matrices in a columnar array format"""
+    AAMatrix, DiAAMatrix = countMatrices(ProteinRecords)
+    ProteinNames = [Record.ProteinName for Record in ProteinRecords]
+    if outputFormat in ["npz", "npy"]:
+        arrays = [("protein_names", numpy.array(ProteinNames)),
+                  ("aa_columns", numpy.array(AAList)),
+                  ("aa_counts", AAMatrix),
+                  ("dipeptide_columns", numpy.array(DiPeptideColumns)),
+                  ("dipeptide_counts", DiAAMatrix)]
+        if outputFormat == "npz":
+            numpy.savez(outName + ".npz", **dict(arrays))
+        else:
+            if not os.path.isdir(outName):
+                os.mkdir(outName)
+            for arrayName, array in arrays:
+                numpy.save(os.path.join(outName, arrayName + ".npy"), array)
+        return
+    
+    #Arrow and Parquet files hold one "Protein Name" column followed by one column for each
+    #amino acid (e.g., "C") and each di-AA sequence (e.g., "GC").
+    pyarrow = importPyarrow()
+    columns = [pyarrow.array(ProteinNames, type=pyarrow.string())]
+    columns += [pyarrow.array(AAMatrix[:, i]) for i in range(len(AAList))]
+    columns += [pyarrow.array(DiAAMatrix[:, i]) for i in range(len(DiPeptideColumns))]
+    table = pyarrow.Table.from_arrays(columns, ["Protein Name"] + AAList + DiPeptideColumns)
+    if outputFormat == "parquet":
+        pyarrow.parquet.write_table(table, outName + ".parquet")
+    else:
+        writer = pyarrow.RecordBatchFileWriter(outName + ".arrow", table.schema)
+        writer.write_table(table)
+        writer.close()
+
+#This saves the count matrices as array files, timed as their own stage by --profile.
+def writeArrays(ProteinRecords, outName, outputFormat):
+    """Function for saving the count matrices as array files"""
+    with stage("write " + outputFormat, len(ProteinRecords)):
+        saveArrays(ProteinRecords, outName, outputFormat)
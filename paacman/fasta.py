@@ -0,0 +1,113 @@
+#Protein amino acid composition analysis = Paacman
+#Finding and reading the FASTA files of a folder.
+
+import re
+#This allows FASTA .txt files to be read in numerical and alphabetical order by file name
+numbers = re.compile(r'(\d+)')
+from itertools import chain
+import os
+
+from paacman.compression import openFasta, splitCompression
+
+#This allows for the proteins to be labeled in numerical order.
+def numericalSort(value):
+	"""Function for sorting files in numerical and alphabetical ascending order"""
+	parts = numbers.split(value)
+	parts[1::2] = map(int, parts[1::2])
+	return parts
+
+#FASTA files with these extensions are read from the user's folder, whether or not they are
+#compressed (e.g., Protein1.fasta.gz).
+FastaExtensions = [".txt", ".fasta", ".fa"]
+
+#This removes the file extension (and any compression extension) from a FASTA file's name.
+def proteinNameFromFile(File):
+    """Function for turning a FASTA file name into a protein name"""
+    ProteinName = os.path.splitext(splitCompression(os.path.basename(File))[0])[0]
+    if ProteinName.endswith(".fasta"): #Removes "fasta" from protein name, if there.
+        ProteinName = ProteinName[:-len(".fasta")]
+    return ProteinName
+
+#This takes the protein name from a FASTA info line (e.g., ">sp|P69905|HBA_HUMAN ...").
+def proteinNameFromHeader(header):
+    """Function for turning a FASTA info line into a protein name"""
+    headerParts = header.lstrip(">").split()
+    if headerParts:
+        return headerParts[0]
+    return ""
+
+#This removes spaces and line breaks from a protein sequence and allows case-insensitivity.
+def normalizeProtein(ProteinRead):
+    """Function for cleaning up a protein sequence read from a FASTA file"""
+    ProteinRead = ProteinRead.replace("\n","").replace("\r","").replace(" ","").replace("\t","")
+    return ProteinRead.upper()
+
+#This finds every FASTA file in a folder (the user's folder by default) in numerical order.
+def fastaFiles(folder="."):
+    """Function for listing the FASTA files in a folder"""
+    Files = [File for File in os.listdir(folder)
+             if os.path.isfile(os.path.join(folder, File))
+             and os.path.splitext(splitCompression(File)[0])[1] in FastaExtensions]
+    return [os.path.join(folder, File) for File in sorted(Files, key=numericalSort)]
+
+#This finds every folder within a folder (the folder itself included) that holds FASTA files,
+#in numerical order. Hidden folders (e.g., .git) are skipped.
+def fastaFolders(root="."):
+    """Function for listing the folders of a folder tree that hold FASTA files"""
+    Folders = []
+    for folder, Subfolders, Files in os.walk(root):
+        Subfolders[:] = sorted((Subfolder for Subfolder in Subfolders
+                                if not Subfolder.startswith(".")), key=numericalSort)
+        if fastaFiles(folder):
+            Folders.append(folder)
+    return Folders
+
+#This reads a FASTA file one protein at a time, so that an entire proteome can be saved in
+#a single file without ever holding more than one protein's sequence in memory.
+#The first line of the file is always treated as the info line, as Paacman always has.
+def readFasta(inFile):
+    """Generator for the (info line, normalized sequence) of each protein in a FASTA file"""
+    header = None
+    sequenceLines = []
+    for line in inFile:
+        if header is None or line.startswith(">"):
+            if header is not None:
+                yield header, normalizeProtein("".join(sequenceLines))
+            header = line.strip()
+            sequenceLines = []
+        else:
+            sequenceLines.append(line)
+    if header is not None:
+        yield header, normalizeProtein("".join(sequenceLines))
+
+#This reads every protein of one FASTA file in order. A file holding a single protein is
+#named after the file (as Paacman always has), while each protein of a multi-FASTA file is
+#named after its info line. Compressed files are decompressed as they're read.
+def readFileSequences(File):
+    """Generator for the (protein name, normalized sequence) of each protein in a file"""
+    with openFasta(File) as inFile:
+        FastaRecords = readFasta(inFile)
+        firstRecord = next(FastaRecords, None)
+        secondRecord = next(FastaRecords, None)
+        if secondRecord is None:
+            if firstRecord is not None:
+                yield proteinNameFromFile(File), firstRecord[1]
+            return
+        
+        recordNum = 1
+        for header, ProteinRead in chain([firstRecord, secondRecord], FastaRecords):
+            ProteinName = proteinNameFromHeader(header)
+            if not ProteinName: #Names proteins that have a blank info line.
+                ProteinName = proteinNameFromFile(File) + "_" + str(recordNum)
+            yield ProteinName, ProteinRead
+            recordNum += 1
+
+#This reads every protein in the user's folder in order. Files defaults to every FASTA file
+#in the user's folder.
+def readProteinSequences(Files=None):
+    """Generator for the (protein name, normalized sequence) of each protein in the files"""
+    if Files is None:
+        Files = fastaFiles()
+    for File in Files:
+        for ProteinSequence in readFileSequences(File):
+            yield ProteinSequence
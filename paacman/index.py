@@ -0,0 +1,206 @@
+#Protein amino acid composition analysis = Paacman
+#The hit index (--index), which records where every di-AA sequence and every motif of the
+#CPS Di-AA sheet is found, so that they can be looked up without reading the proteins again:
+#    python -m paacman.index "AA Analysis for data index.npz" GC --near 40 --within 5
+#    python -m paacman.index "AA Analysis for data index.npz" "D[GS]" --top 10
+
+import numpy #Needs to be installed by the user!
+from collections import namedtuple
+import argparse
+import sys
+
+from paacman.aminoacids import AAList, AAIndex, DiPeptideColumns
+from paacman.counting import encodeProtein
+from paacman.kmercounts import kmerCodes
+from paacman.motifs import DefaultMotifMatcher, findMotifCodes
+from paacman.profiling import stage
+
+#This holds the hits of every di-AA sequence and every motif of a group of proteins. The hits
+#of di-AA sequence i (in DiPeptideColumns order) are entries DiPeptideOffsets[i] to
+#DiPeptideOffsets[i + 1] of DiPeptideProteins (the protein's number in ProteinNames) and
+#DiPeptidePositions (the position of the hit's first residue, counted from 0), sorted by
+#protein and position. Motif hits are laid out the same way, in the order of Motifs.
+ProteinIndex = namedtuple("ProteinIndex", ["ProteinNames", "DiPeptideOffsets",
+                                           "DiPeptideProteins", "DiPeptidePositions",
+                                           "Motifs", "MotifSetTitles", "MotifOffsets",
+                                           "MotifProteins", "MotifPositions"])
+
+#This lists the motifs that each sequence of a motif length stands for, as the number of
+#motifs of each sequence, where each sequence's motifs start and the motifs themselves.
+def sequenceMotifs(Length):
+    """Function for grouping the motifs of a motif length by sequence"""
+    MotifsPerSequence = numpy.bincount(Length.SequenceIndex, minlength=len(Length.Codes))
+    starts = numpy.cumsum(MotifsPerSequence) - MotifsPerSequence
+    order = numpy.argsort(Length.SequenceIndex, kind="mergesort")
+    return MotifsPerSequence, starts, Length.MotifIndex[order]
+
+#This finds every hit of every motif of a matcher in an encoded protein, as the motif's
+#number and the position of the hit. A sequence matched by several motifs (e.g., DG for
+#D[GS] and DG) is a hit of each of them. SequenceMotifs holds sequenceMotifs() of each
+#motif length.
+def motifHitPositions(EncodedProtein, Matcher, SequenceMotifs):
+    """Function for finding the (motif, position) of each motif hit in an encoded protein"""
+    MotifNumbers = [numpy.zeros(0, dtype=numpy.int64)]
+    Positions = [numpy.zeros(0, dtype=numpy.int64)]
+    for length, Length in Matcher.Lengths.items():
+        MotifsPerSequence, starts, MotifsBySequence = SequenceMotifs[length]
+        positions, found = findMotifCodes(Length.Codes, kmerCodes(EncodedProtein, length))
+        hitPositions = numpy.flatnonzero(found)
+        sequences = positions[hitPositions]
+        repeats = MotifsPerSequence[sequences]
+        within = numpy.arange(repeats.sum()) - numpy.repeat(numpy.cumsum(repeats) - repeats,
+                                                            repeats)
+        MotifNumbers.append(MotifsBySequence[numpy.repeat(starts[sequences], repeats) + within])
+        Positions.append(numpy.repeat(hitPositions, repeats))
+    return numpy.concatenate(MotifNumbers), numpy.concatenate(Positions)
+
+#This sorts the (keys, positions) hits of each protein by what they are a hit of (e.g., the
+#di-AA sequence), keeping hits of the same thing in protein and position order, into the
+#offsets, proteins and positions of an index.
+def sortedHits(ProteinHits, keyTotal):
+    """Function for grouping the hits of every protein by what they are a hit of"""
+    keys = numpy.concatenate([numpy.zeros(0, dtype=numpy.int64)] +
+                             [Hits[0] for Hits in ProteinHits])
+    positions = numpy.concatenate([numpy.zeros(0, dtype=numpy.int64)] +
+                                  [Hits[1] for Hits in ProteinHits])
+    proteins = numpy.repeat(numpy.arange(len(ProteinHits), dtype=numpy.uint32),
+                            [len(Hits[0]) for Hits in ProteinHits])
+    #Sorting each key together with its place (key * hits + place) keeps hits of the same key
+    #in order, and is several times faster than a stable argsort of the keys.
+    order = numpy.sort(keys * len(keys) + numpy.arange(len(keys))) % max(len(keys), 1)
+    offsets = numpy.zeros(keyTotal + 1, dtype=numpy.int64)
+    offsets[1:] = numpy.cumsum(numpy.bincount(keys, minlength=keyTotal))
+    return offsets, proteins[order], positions[order].astype(numpy.uint32)
+
+#This reads (protein name, sequence) pairs into a hit index of every di-AA sequence and every
+#motif of a matcher.
+def buildIndex(ProteinSequences, Matcher=DefaultMotifMatcher):
+    """Function for building the hit index of (protein name, sequence) pairs"""
+    SequenceMotifs = dict((length, sequenceMotifs(Length))
+                          for length, Length in Matcher.Lengths.items())
+    ProteinNames = []
+    DiPeptideHits = []
+    MotifHits = []
+    for proteinNum, (ProteinName, ProteinRead) in enumerate(ProteinSequences):
+        ProteinNames.append(ProteinName)
+        EncodedProtein = encodeProtein(ProteinRead)
+        first = EncodedProtein[:-1].astype(numpy.int64)
+        second = EncodedProtein[1:]
+        positions = numpy.flatnonzero((first < len(AAList)) & (second < len(AAList)))
+        DiPeptideHits.append((first[positions] * len(AAList) + second[positions],
+                              positions))
+        MotifHits.append(motifHitPositions(EncodedProtein, Matcher, SequenceMotifs))
+    Motifs = [motif for Set in Matcher.MotifSets for motif in Set.Motifs]
+    MotifSetTitles = [Set.Title for Set in Matcher.MotifSets for motif in Set.Motifs]
+    return ProteinIndex(numpy.array(ProteinNames),
+                        *(sortedHits(DiPeptideHits, len(DiPeptideColumns)) +
+                          (numpy.array(Motifs), numpy.array(MotifSetTitles)) +
+                          sortedHits(MotifHits, len(Motifs))))
+
+#This saves a hit index as an .npz file.
+def saveIndex(Index, fileName):
+    """Function for saving a hit index"""
+    numpy.savez(fileName, **dict((field, getattr(Index, field)) for field in Index._fields))
+
+#This loads a hit index saved by saveIndex().
+def loadIndex(fileName):
+    """Function for loading a hit index"""
+    with open(fileName, "rb") as inFile:
+        Arrays = numpy.load(inFile)
+        return ProteinIndex(*[Arrays[field] for field in ProteinIndex._fields])
+
+#This builds the hit index of FASTA files and saves it, timed as its own stage by --profile.
+def writeIndex(ProteinSequences, Matcher, fileName):
+    """Function for building and saving the hit index of FASTA files"""
+    with stage("write index") as Counts:
+        Index = buildIndex(ProteinSequences, Matcher)
+        Counts["proteins"] = len(Index.ProteinNames)
+        saveIndex(Index, fileName)
+
+#This finds the hits of a motif of the index (as written in its motif set, e.g. "D[GS]") or
+#of any di-AA sequence (e.g., "GC"), as arrays of protein numbers and positions.
+def indexedHits(Index, motif):
+    """Function for finding the (protein, position) arrays of a motif's hits"""
+    motif = motif.upper()
+    Motifs = [indexMotif.upper() for indexMotif in Index.Motifs.tolist()]
+    if motif in Motifs:
+        first, last = Index.MotifOffsets[Motifs.index(motif):][:2]
+        return Index.MotifProteins[first:last], Index.MotifPositions[first:last]
+    if len(motif) == 2 and all(AA in AAIndex for AA in motif):
+        code = AAIndex[motif[0]] * len(AAList) + AAIndex[motif[1]]
+        first, last = Index.DiPeptideOffsets[code:code + 2]
+        return Index.DiPeptideProteins[first:last], Index.DiPeptidePositions[first:last]
+    raise ValueError("The motif " + motif + " is neither a di-AA sequence nor a motif of the "
+                     "index.")
+
+#This lists the hits of a motif as (protein name, residue number) pairs, counting residues
+#from 1 as in the worst windows report. With near, only hits whose first residue is within
+#that many residues of near are listed (e.g., a GC junction near residue 40).
+def hits(Index, motif, near=None, within=0):
+    """Function for listing the hits of a motif in the index"""
+    proteins, positions = indexedHits(Index, motif)
+    residues = positions.astype(numpy.int64) + 1
+    if near is not None:
+        kept = numpy.abs(residues - near) <= within
+        proteins, residues = proteins[kept], residues[kept]
+    return [(Index.ProteinNames[proteinNum], residue)
+            for proteinNum, residue in zip(proteins.tolist(), residues.tolist())]
+
+#This gives the residue numbers of every hit of a motif in one protein (or in every protein
+#with that name).
+def proteinHits(Index, motif, ProteinName):
+    """Function for finding where a motif is found in a protein"""
+    proteins, positions = indexedHits(Index, motif)
+    residues = []
+    for proteinNum in numpy.flatnonzero(Index.ProteinNames == ProteinName):
+        first, last = numpy.searchsorted(proteins, [proteinNum, proteinNum + 1])
+        residues.append(positions[first:last].astype(numpy.int64) + 1)
+    if not residues:
+        raise ValueError("The protein " + ProteinName + " is not in the index.")
+    return numpy.concatenate(residues)
+
+#This lists the n proteins with the most hits of a motif as (protein name, hits) pairs, in
+#the order they were read when they have as many hits.
+def topProteins(Index, motif, n=10):
+    """Function for finding the proteins with the most hits of a motif"""
+    proteins, positions = indexedHits(Index, motif)
+    HitCounts = numpy.bincount(proteins, minlength=len(Index.ProteinNames))
+    order = numpy.argsort(-HitCounts, kind="mergesort")[:n]
+    return [(Index.ProteinNames[proteinNum], int(HitCounts[proteinNum]))
+            for proteinNum in order if HitCounts[proteinNum]]
+
+#This answers questions about a hit index from the command line.
+def main():
+    """Function for querying a hit index from the command line"""
+    parser = argparse.ArgumentParser(
+        description="Look up the hits of a di-AA sequence or motif in a Paacman hit index")
+    parser.add_argument("index", help="hit index saved by Paacman with --index")
+    parser.add_argument("motif", help="di-AA sequence (e.g., GC) or motif of the CPS Di-AA "
+                                      "sheet (e.g., D[GS])")
+    parser.add_argument("--protein", metavar="NAME",
+                        help="list where the motif is found in one protein")
+    parser.add_argument("--near", type=int, metavar="RESIDUE",
+                        help="only list hits whose first residue is near this residue")
+    parser.add_argument("--within", type=int, default=0, metavar="N",
+                        help="how many residues from --near a hit may be (default: 0)")
+    parser.add_argument("--top", type=int, metavar="N",
+                        help="list the N proteins with the most hits instead")
+    args = parser.parse_args()
+    try:
+        Index = loadIndex(args.index)
+        if args.top is not None:
+            for ProteinName, count in topProteins(Index, args.motif, args.top):
+                print ProteinName + "\t" + str(count)
+        elif args.protein is not None:
+            residues = proteinHits(Index, args.motif, args.protein)
+            print args.protein + "\t" + ", ".join(str(residue) for residue in residues)
+        else:
+            for ProteinName, residue in hits(Index, args.motif, args.near, args.within):
+                print ProteinName + "\t" + str(residue)
+    except (ValueError, IOError, KeyError) as error:
+        print error
+        print "Paacman terminated."
+        sys.exit()
+
+if __name__ == "__main__":
+    main()
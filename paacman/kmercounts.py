@@ -0,0 +1,141 @@
+#Protein amino acid composition analysis = Paacman
+#Counting k-mers (runs of k amino acids, e.g. tripeptides for k = 3) of encoded proteins.
+
+import numpy #Needs to be installed by the user!
+import csv
+
+from paacman.aminoacids import AAList
+
+#k-mers with up to this many amino acids (8,000 tripeptides) are counted into a dense array
+#with a place for every k-mer. Longer k-mers are saved sparsely, as the (k-mer code, count)
+#pairs of the k-mers that are actually found.
+DenseKmerSize = 3
+
+#k-mer codes are base 21 numbers (20 canonical amino acids and 1 for anything else) held in
+#64 bits, which allows k-mers of up to 14 amino acids (21 ** 14).
+KmerBase = len(AAList) + 1
+MaxKmerSize = 14
+
+#This finds where each canonical k-mer (in base 20 order) sits among the base 21 codes, so
+#that dense counts can be read straight out of a bincount of base 21 codes.
+DenseKmerPositions = dict((k, numpy.arange(KmerBase ** k).reshape((KmerBase,) * k)
+                              [(slice(0, len(AAList)),) * k].ravel())
+                          for k in range(1, DenseKmerSize + 1))
+
+#This turns every k-mer of an encoded protein into one number by reading it as a base 21
+#number (e.g., "CA" = 1 * 21 + 0). The code of each k-mer is built from the one before it,
+#one amino acid at a time, for all of the k-mers at once. Non-canonical residues (e.g., X)
+#are the 21st digit, so that k-mers containing them can be dropped after counting.
+def kmerCodes(EncodedProtein, k):
+    """Function for encoding every k-mer of an encoded protein as a base 21 number"""
+    kmerTotal = max(len(EncodedProtein) - k + 1, 0)
+    codes = EncodedProtein[:kmerTotal].astype(numpy.int64)
+    for j in range(1, k):
+        codes = KmerBase * codes + EncodedProtein[j:j + kmerTotal]
+    return codes
+
+#This turns base 21 k-mer codes into the base 20 codes of canonical k-mers (e.g., "CA" =
+#1 * 20 + 0), dropping every k-mer that holds a non-canonical residue, the same way
+#occurrences() never finds them. It gives the base 20 codes and which codes were kept.
+def canonicalKmerCodes(codes, k):
+    """Function for turning base 21 k-mer codes into base 20 codes of canonical k-mers"""
+    canonicalCodes = numpy.zeros(len(codes), dtype=numpy.int64)
+    canonical = numpy.ones(len(codes), dtype=bool)
+    place = 1
+    for i in range(k):
+        codes, AAPosition = numpy.divmod(codes, KmerBase)
+        canonical &= AAPosition < len(AAList)
+        canonicalCodes += AAPosition * place
+        place *= len(AAList)
+    return canonicalCodes[canonical], canonical
+
+#This counts every overlapping k-mer of an encoded protein (e.g., EEE = 2 EE's). Small k
+#give a dense array indexed by k-mer code; large k give sparse (k-mer codes, counts) arrays.
+#Dense counts are made with a single bincount over every base 21 code, from which only the
+#canonical k-mers are kept. k must be between 1 and MaxKmerSize.
+def kmerCounts(EncodedProtein, k):
+    """Function for counting the k-mers of an encoded protein"""
+    if not 1 <= k <= MaxKmerSize:
+        raise ValueError("k-mers must be between 1 and " + str(MaxKmerSize) +
+                         " amino acids long, not " + str(k) + ".")
+    codes = kmerCodes(EncodedProtein, k)
+    if k <= DenseKmerSize:
+        counts = numpy.bincount(codes, minlength=KmerBase ** k)
+        return counts[DenseKmerPositions[k]].astype(numpy.uint32)
+    codes, counts = numpy.unique(codes, return_counts=True)
+    codes, canonical = canonicalKmerCodes(codes, k)
+    order = numpy.argsort(codes)
+    return codes[order], counts[canonical][order].astype(numpy.uint32)
+
+#This turns dense k-mer counts into sparse (k-mer codes, counts) arrays of the k-mers found.
+def sparseKmers(KmerCounts):
+    """Function for turning dense or sparse k-mer counts into sparse k-mer counts"""
+    if isinstance(KmerCounts, tuple):
+        return KmerCounts
+    codes = numpy.flatnonzero(KmerCounts)
+    return codes.astype(numpy.int64), KmerCounts[codes]
+
+#This turns a k-mer code back into its amino acids (e.g., 20 = "CA" for k = 2).
+def kmerName(code, k):
+    """Function for turning a k-mer code into its amino acid sequence"""
+    letters = []
+    for i in range(k):
+        code, AAPosition = divmod(int(code), len(AAList))
+        letters.append(AAList[AAPosition])
+    return "".join(reversed(letters))
+
+#This adds up the k-mer counts of many proteins (e.g., for a whole proteome).
+def sumKmers(KmerCountsList, k):
+    """Function for totalling the k-mer counts of a list of proteins"""
+    if k <= DenseKmerSize:
+        total = numpy.zeros(len(AAList) ** k, dtype=numpy.int64)
+        for KmerCounts in KmerCountsList:
+            total += KmerCounts
+        return total
+    SparseCounts = [sparseKmers(KmerCounts) for KmerCounts in KmerCountsList]
+    if not SparseCounts:
+        return numpy.zeros(0, dtype=numpy.int64), numpy.zeros(0, dtype=numpy.int64)
+    codes, positions = numpy.unique(numpy.concatenate([i[0] for i in SparseCounts]),
+                                    return_inverse=True)
+    counts = numpy.bincount(positions,
+                            weights=numpy.concatenate([i[1] for i in SparseCounts]),
+                            minlength=len(codes))
+    return codes, counts.astype(numpy.int64)
+
+#This finds the n most common k-mers, as (k-mer, count) pairs. k-mers with the same count
+#are listed in alphabetical (AAList) order.
+def topKmers(KmerCounts, k, n=10):
+    """Function for listing the most common k-mers of a protein or group of proteins"""
+    codes, counts = sparseKmers(KmerCounts)
+    order = numpy.lexsort((codes, -counts.astype(numpy.int64)))[:n]
+    return [(kmerName(codes[i], k), int(counts[i])) for i in order]
+
+#This saves the n most common k-mers of the whole group of proteins ("All Proteins") and of
+#each protein as a CSV file, one k-mer per row.
+def writeKmerReport(ProteinRecords, k, n, fileName):
+    """Function for saving the most common k-mers of each protein as a CSV file"""
+    with open(fileName, "wb") as outFile:
+        writer = csv.writer(outFile)
+        writer.writerow(["Protein Name", "Rank", str(k) + "-mer", "Count"])
+        TotalCounts = sumKmers([Record.KmerCounts[k] for Record in ProteinRecords], k)
+        Proteins = [("All Proteins", TotalCounts)]
+        Proteins += [(Record.ProteinName, Record.KmerCounts[k]) for Record in ProteinRecords]
+        for ProteinName, KmerCounts in Proteins:
+            for rank, (kmer, count) in enumerate(topKmers(KmerCounts, k, n)):
+                writer.writerow([ProteinName, rank + 1, kmer, count])
+
+#This saves the k-mer counts of every protein as a sparse .npz file. The k-mers of protein i
+#are kmer_codes[offsets[i]:offsets[i + 1]] with counts[offsets[i]:offsets[i + 1]], and a
+#k-mer code can be read back into amino acids with kmerName().
+def writeKmerArrays(ProteinRecords, k, fileName):
+    """Function for saving the k-mer counts of every protein as sparse arrays"""
+    SparseCounts = [sparseKmers(Record.KmerCounts[k]) for Record in ProteinRecords]
+    offsets = numpy.zeros(len(SparseCounts) + 1, dtype=numpy.int64)
+    offsets[1:] = numpy.cumsum([len(i[0]) for i in SparseCounts])
+    numpy.savez(fileName,
+                protein_names=numpy.array([Record.ProteinName for Record in ProteinRecords]),
+                k=numpy.array(k), offsets=offsets,
+                kmer_codes=numpy.concatenate([numpy.zeros(0, dtype=numpy.int64)] +
+                                             [i[0] for i in SparseCounts]),
+                counts=numpy.concatenate([numpy.zeros(0, dtype=numpy.uint32)] +
+                                         [i[1] for i in SparseCounts]))
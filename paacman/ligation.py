@@ -0,0 +1,188 @@
+#Protein amino acid composition analysis = Paacman
+#Planning where to cut each protein into segments for chemical protein synthesis by native
+#chemical ligation (--ligation-plan). Each segment after the first starts at the Cys or Ala
+#of a ligation site (Ala sites are ligated at Cys and desulfurized), and no segment may be
+#longer than can be made by solid phase peptide synthesis.
+
+import numpy #Needs to be installed by the user!
+from collections import namedtuple
+from functools import partial
+import csv
+
+from paacman.aminoacids import (AAList, AAIndex, CysLigList, AlaLigList, AspartimideList,
+                                PSList)
+from paacman.counting import ProteinChunkSize, encodeProtein
+from paacman.profiling import stage
+
+#How the segments of a plan are chosen: no segment may be longer than MaxSegment residues
+#and every ligation costs LigationCost. Each segment is made by solid phase peptide
+#synthesis from its last residue to its first, so a possible aspartimide (D followed by any
+#amino acid) is exposed to one more round of deprotection for every residue added after it;
+#it costs AspartimidePenalty for every MaxSegment residues between it and the start of its
+#segment. Long stretches without a possible pseudoproline site (X followed by S or T) tend
+#to aggregate, so every stretch of a segment between pseudoproline sites (or the ends of the
+#segment) costs AggregationPenalty times the square of its length over MaxSegment. The plan
+#of a protein is the one that costs least.
+PlanSettings = namedtuple("PlanSettings", ["MaxSegment", "LigationCost", "AspartimidePenalty",
+                                           "AggregationPenalty"])
+DefaultMaxSegment = 50
+DefaultPlanSettings = PlanSettings(DefaultMaxSegment, 1.0, 1.0, 1.0)
+
+#The plan of a protein: the (first, last) residue of each segment, counting from 1, and the
+#cost of the plan, or no segments (None) when the protein can't be cut into short enough
+#segments.
+LigationPlan = namedtuple("LigationPlan", ["ProteinName", "ProteinRead", "Segments", "Cost"])
+
+#This turns a list of di-AA sequences into a table of which of the 400 di-AA codes
+#(1st AA * 20 + 2nd AA) are in the list.
+def diPeptideTable(DiPeptides):
+    """Function for building a lookup table of a list of di-AA sequences"""
+    Table = numpy.zeros(len(AAList) ** 2, dtype=bool)
+    for DiPeptide in DiPeptides:
+        Table[AAIndex[DiPeptide[0]] * len(AAList) + AAIndex[DiPeptide[1]]] = True
+    return Table
+
+LigationSites = diPeptideTable(CysLigList + AlaLigList)
+Aspartimides = diPeptideTable(AspartimideList)
+Pseudoprolines = diPeptideTable(PSList)
+
+#This finds which positions of an encoded protein start one of the di-AA sequences of a
+#lookup table. Pairs holding a non-canonical residue are never found.
+def diPeptideStarts(EncodedProtein, Table):
+    """Function for finding where the di-AA sequences of a table start in a protein"""
+    first = EncodedProtein[:-1].astype(numpy.int64)
+    second = EncodedProtein[1:]
+    canonical = (first < len(AAList)) & (second < len(AAList))
+    starts = numpy.zeros(len(first), dtype=bool)
+    starts[canonical] = Table[first[canonical] * len(AAList) + second[canonical]]
+    return starts
+
+#This counts how many di-AA sequences start before each position of a protein, so that the
+#sites lying wholly within residues a to b - 1 (counting from 0) are sites[b - 1] - sites[a].
+def siteTotals(starts):
+    """Function for the running totals of the di-AA sites of a protein"""
+    sites = numpy.zeros(len(starts) + 1, dtype=numpy.int64)
+    sites[1:] = numpy.cumsum(starts)
+    return sites
+
+#This gives the cost of every segment from each of starts to end (counting from 0, end not
+#included) apart from the ligation. Aspartimide exposure adds up as the running totals of
+#the sites' positions less the segment's start for each site. Stretches are split before the
+#S or T of each pseudoproline site (Breaks); the stretches between two breaks within the
+#segment are added up from the running totals of the squared gaps between breaks.
+def segmentCosts(starts, end, Settings, AspartimideSites, AspartimidePositions, Breaks,
+                 GapSquares):
+    """Function for the aspartimide and aggregation costs of segments ending at a residue"""
+    sites = AspartimideSites[end - 1] - AspartimideSites[starts]
+    exposure = AspartimidePositions[end - 1] - AspartimidePositions[starts] - starts * sites
+    firstBreaks = numpy.searchsorted(Breaks, starts, side="right")
+    lastBreak = numpy.searchsorted(Breaks, end, side="left")
+    split = firstBreaks < lastBreak
+    stretches = (end - starts) ** 2
+    if split.any():
+        first = firstBreaks[split]
+        stretches[split] = ((Breaks[first] - starts[split]) ** 2 +
+                            GapSquares[lastBreak - 1] - GapSquares[first] +
+                            (end - Breaks[lastBreak - 1]) ** 2)
+    return (Settings.AspartimidePenalty * exposure / float(Settings.MaxSegment) +
+            Settings.AggregationPenalty * stretches / float(Settings.MaxSegment) ** 2)
+
+#This plans the segments of a protein with dynamic programming over the places it can be cut
+#(before the Cys or Ala of each ligation site). The cheapest plan ending at each cut is
+#found from the cuts at most MaxSegment residues before it, so the planning takes time in
+#proportion to the protein's length times the number of cuts within a segment's length.
+def planProtein(ProteinName, ProteinRead, Settings=DefaultPlanSettings):
+    """Function for planning the ligation segments of a protein"""
+    EncodedProtein = encodeProtein(ProteinRead)
+    length = len(EncodedProtein)
+    if length == 0:
+        return LigationPlan(ProteinName, ProteinRead, None, None)
+    Cuts = numpy.concatenate(([0],
+                              numpy.flatnonzero(diPeptideStarts(EncodedProtein,
+                                                                LigationSites)) + 1,
+                              [length]))
+    AspartimideStarts = diPeptideStarts(EncodedProtein, Aspartimides)
+    AspartimideSites = siteTotals(AspartimideStarts)
+    AspartimidePositions = siteTotals(AspartimideStarts *
+                                      numpy.arange(len(AspartimideStarts)))
+    Breaks = numpy.flatnonzero(diPeptideStarts(EncodedProtein, Pseudoprolines)) + 1
+    GapSquares = numpy.concatenate(([0], numpy.cumsum(numpy.diff(Breaks) ** 2)))
+    Costs = numpy.full(len(Cuts), numpy.inf)
+    Costs[0] = 0.0
+    Previous = numpy.zeros(len(Cuts), dtype=numpy.intp)
+    for cutNum in range(1, len(Cuts)):
+        end = Cuts[cutNum]
+        first = numpy.searchsorted(Cuts, end - Settings.MaxSegment)
+        if first == cutNum:
+            continue
+        starts = Cuts[first:cutNum]
+        SegmentCosts = (Costs[first:cutNum] + Settings.LigationCost * (starts > 0) +
+                        segmentCosts(starts, end, Settings, AspartimideSites,
+                                     AspartimidePositions, Breaks, GapSquares))
+        best = numpy.argmin(SegmentCosts)
+        Costs[cutNum] = SegmentCosts[best]
+        Previous[cutNum] = first + best
+    if numpy.isinf(Costs[-1]):
+        return LigationPlan(ProteinName, ProteinRead, None, None)
+
+    #Follows the cheapest plan back from the end of the protein.
+    Segments = []
+    cutNum = len(Cuts) - 1
+    while cutNum > 0:
+        Segments.append((int(Cuts[Previous[cutNum]]) + 1, int(Cuts[cutNum])))
+        cutNum = Previous[cutNum]
+    return LigationPlan(ProteinName, ProteinRead, Segments[::-1], float(Costs[-1]))
+
+#This allows planProtein() to be handed out to the processes of --jobs, which pass a single
+#(protein name, sequence) pair.
+def planProteinSequence(ProteinSequence, Settings=DefaultPlanSettings):
+    """Function for planning the ligation segments of a (protein name, sequence) pair"""
+    return planProtein(ProteinSequence[0], ProteinSequence[1], Settings)
+
+#This plans every protein of (protein name, sequence) pairs in order. With more than 1 job,
+#the proteins are handed out to a pool of processes in chunks.
+def planProteins(ProteinSequences, Settings=DefaultPlanSettings, jobs=1):
+    """Generator for the ligation plan of each (protein name, sequence) pair"""
+    if jobs == 1:
+        for ProteinName, ProteinRead in ProteinSequences:
+            yield planProtein(ProteinName, ProteinRead, Settings)
+        return
+    import multiprocessing #Only needed when planning with more than 1 process.
+    pool = multiprocessing.Pool(jobs)
+    try:
+        for Plan in pool.imap(partial(planProteinSequence, Settings=Settings),
+                              ProteinSequences, chunksize=ProteinChunkSize):
+            yield Plan
+    finally:
+        pool.close()
+        pool.join()
+
+#This saves the ligation plan of every protein as a CSV file, one segment per row, with the
+#ligation site each segment starts at and the possible aspartimides and pseudoproline sites
+#within it. Proteins that can't be planned get a single row without segments.
+def writeLigationPlans(ProteinSequences, fileName, Settings=DefaultPlanSettings, jobs=1):
+    """Function for saving the ligation plan of each protein as a CSV file"""
+    with stage("write ligation plans") as Counts:
+        with open(fileName, "wb") as outFile:
+            writer = csv.writer(outFile)
+            writer.writerow(["Protein Name", "Segments", "Segment", "First Residue",
+                             "Last Residue", "Length", "Ligation Site",
+                             "Possible Aspartimides", "Possible Pseudoprolines", "Plan Cost"])
+            for Plan in planProteins(ProteinSequences, Settings, jobs):
+                Counts["proteins"] += 1
+                if Plan.Segments is None:
+                    writer.writerow([Plan.ProteinName, 0, "", "", "", len(Plan.ProteinRead),
+                                     "", "", "", "No plan"])
+                    continue
+                EncodedProtein = encodeProtein(Plan.ProteinRead)
+                AspartimideSites = siteTotals(diPeptideStarts(EncodedProtein, Aspartimides))
+                PseudoprolineSites = siteTotals(diPeptideStarts(EncodedProtein,
+                                                                Pseudoprolines))
+                for segmentNum, (first, last) in enumerate(Plan.Segments):
+                    site = Plan.ProteinRead[first - 2:first] if first > 1 else ""
+                    writer.writerow([Plan.ProteinName, len(Plan.Segments), segmentNum + 1,
+                                     first, last, last - first + 1, site,
+                                     AspartimideSites[last - 1] - AspartimideSites[first - 1],
+                                     PseudoprolineSites[last - 1] -
+                                     PseudoprolineSites[first - 1],
+                                     round(Plan.Cost, 2)])
@@ -0,0 +1,81 @@
+#Protein amino acid composition analysis = Paacman
+#Combining the partial results of a run split across several computers with --shard into
+#the output files of a single run, e.g. once every shard has been run on a shared folder:
+#    python -m paacman.merge "AA Analysis for data shard "*" of 8.npz"
+#    python -m paacman.merge shards/*.npz --format npz --out "AA Analysis for proteome"
+
+import argparse
+import sys
+
+from paacman.export import OutputFormats, importPyarrow, writeArrays
+from paacman.motifs import compileMotifs
+from paacman.shard import loadShard, mergeShards, shardMotifSets
+from paacman.cli import reportParts
+
+#This merges partial results from the command line.
+def main():
+    """Function for merging the partial results of a sharded run from the command line"""
+    parser = argparse.ArgumentParser(
+        description="Combine the partial results of a Paacman run split with --shard into "
+                    "its output files")
+    parser.add_argument("partials", nargs="+", metavar="PARTIAL",
+                        help="partial result of each shard, saved by Paacman with --shard")
+    parser.add_argument("--out", metavar="NAME",
+                        help="name of the output files, without extension (default: the name "
+                             "of the sharded run, e.g. 'AA Analysis for data')")
+    parser.add_argument("--format", action="append", choices=OutputFormats, dest="formats",
+                        help="output file to write: " + ", ".join(OutputFormats) +
+                             " (default: xlsx; may be given more than once)")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N",
+                        help="number of processes used to write the parts of a split Excel file "
+                             "(default: 1)")
+    parser.add_argument("--values", action="store_true",
+                        help="write totals and percentages as values calculated by Paacman "
+                             "instead of Excel formulas, so the workbook opens instantly")
+    parser.add_argument("--write-only", action="store_true",
+                        help="stream the Excel file to disk row by row, which keeps memory "
+                             "use flat for large outputs (titles are not merged)")
+    parser.add_argument("--proteins-per-workbook", type=int, metavar="N",
+                        help="split the Excel file into parts of at most N proteins, along "
+                             "with a summary workbook of the totals (default: split only "
+                             "when a sheet would run past Excel's row limit)")
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.proteins_per_workbook is not None and args.proteins_per_workbook < 1:
+        parser.error("--proteins-per-workbook must be at least 1")
+    formats = args.formats or ["xlsx"]
+    try:
+        if "arrow" in formats or "parquet" in formats:
+            importPyarrow()
+        Partials = [loadShard(fileName) for fileName in args.partials]
+        ProteinRecords = mergeShards(Partials)
+    except ImportError:
+        print "Arrow and Parquet files need the pyarrow library to be installed."
+        print "Please install pyarrow, or save the counts as npz or npy files instead."
+        print "Paacman terminated."
+        sys.exit()
+    except (ValueError, IOError, KeyError) as error:
+        print error
+        print "Paacman terminated."
+        sys.exit()
+    if not ProteinRecords:
+        print "The partial results hold no proteins!"
+        print "Paacman terminated."
+        sys.exit()
+    outName = args.out or str(Partials[0]["OutName"])
+    Matcher = compileMotifs(shardMotifSets(Partials[0]))
+
+    #Writes the same output files as a run on a single computer.
+    if "xlsx" in formats:
+        from paacman.workbook import writeWorkbooks
+        reportParts(writeWorkbooks(ProteinRecords, outName, args.write_only, not args.values,
+                                   Matcher, args.jobs, args.proteins_per_workbook))
+    for outputFormat in formats:
+        if outputFormat != "xlsx":
+            writeArrays(ProteinRecords, outName, outputFormat)
+    print "Merged " + str(len(Partials)) + " shards of " + str(len(ProteinRecords)) + \
+          " proteins into " + outName + "."
+
+if __name__ == "__main__":
+    main()
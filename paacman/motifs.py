@@ -0,0 +1,202 @@
+#Protein amino acid composition analysis = Paacman
+#Motif sets (e.g., ligation sites) that are counted into the blocks of the CPS Di-AA sheet.
+
+import numpy #Needs to be installed by the user!
+from collections import namedtuple
+from itertools import product
+import ConfigParser
+import re
+
+from paacman.aminoacids import (AAList, AAIndex, CysLigList, AlaLigList, AspartimideList,
+                                PSList)
+from paacman.kmercounts import DenseKmerSize, KmerBase, MaxKmerSize, kmerCodes
+
+#A titled set of motifs, written as one block of the CPS Di-AA sheet.
+MotifSet = namedtuple("MotifSet", ["Title", "Motifs"])
+
+#The motif sets that Paacman has always counted.
+DefaultMotifSets = [MotifSet("Cysteine Ligation Sites", CysLigList),
+                    MotifSet("Alanine Ligation Sites", AlaLigList),
+                    MotifSet("Possible Aspartimides", AspartimideList),
+                    MotifSet("Possible Pseudoprolines", PSList)]
+
+#A motif may not stand for more sequences than this (e.g., "XXXX" = 160,000 tetrapeptides).
+MaxMotifSequences = len(AAList) ** 4
+
+#Each position of a motif is an amino acid (e.g., "D"), a choice of amino acids in square
+#brackets (e.g., "[GS]") or X for any amino acid.
+motifPosition = re.compile(r'\[([A-Z]+)\]|([A-Z])')
+
+#This turns a motif (e.g., "D[GS]") into every sequence it stands for (e.g., "DG", "DS").
+#Motifs are matched as k-mer codes, so they can't be longer than MaxKmerSize positions.
+def expandMotif(motif):
+    """Function for listing the amino acid sequences that a motif matches"""
+    Positions = []
+    end = 0
+    for match in motifPosition.finditer(motif.upper()):
+        if match.start() != end:
+            break
+        end = match.end()
+        letters = match.group(1) or match.group(2)
+        if letters == "X":
+            letters = "".join(AAList)
+        if any(letter not in AAIndex for letter in letters):
+            raise ValueError("The motif " + motif + " holds a letter that isn't a canonical "
+                             "amino acid.")
+        Positions.append(sorted(set(letters)))
+    if end != len(motif) or not Positions:
+        raise ValueError("The motif " + motif + " can't be read. Motifs are made of amino "
+                         "acids, choices in square brackets (e.g., D[GS]) and X.")
+    if len(Positions) > MaxKmerSize:
+        raise ValueError("The motif " + motif + " is longer than " + str(MaxKmerSize) +
+                         " amino acids.")
+    if numpy.prod([len(letters) for letters in Positions]) > MaxMotifSequences:
+        raise ValueError("The motif " + motif + " matches too many sequences.")
+    return ["".join(sequence) for sequence in product(*Positions)]
+
+#This reads motif sets from a config file, in which each [section] is one block of the CPS
+#Di-AA sheet and lists its motifs, separated by spaces or commas:
+#    [Serine/Threonine Ligation Sites]
+#    motifs = AS AT CS CT DS DT
+def readMotifSets(fileName):
+    """Function for reading motif sets from a config file"""
+    config = ConfigParser.RawConfigParser()
+    if not config.read(fileName):
+        raise ValueError("The motif file " + fileName + " could not be read.")
+    MotifSets = []
+    for title in config.sections():
+        if not config.has_option(title, "motifs"):
+            raise ValueError("The motif set [" + title + "] has no motifs = line.")
+        Motifs = config.get(title, "motifs").replace(",", " ").split()
+        if not Motifs:
+            raise ValueError("The motif set [" + title + "] has no motifs.")
+        for motif in Motifs:
+            expandMotif(motif) #Makes sure every motif can be read before counting starts.
+        MotifSets.append(MotifSet(title, Motifs))
+    if not MotifSets:
+        raise ValueError("The motif file " + fileName + " has no motif sets.")
+    return MotifSets
+
+#Every motif of every set, compiled into one table of k-mer codes for each motif length.
+#For a length, Codes holds the sorted base 21 codes of every sequence a motif stands for
+#(each sequence once, however many motifs share it), CanonicalCodes the base 20 codes of
+#the same sequences, and the (SequenceIndex, MotifIndex) pairs say which motif column
+#each sequence is counted towards.
+MotifMatcher = namedtuple("MotifMatcher", ["MotifSets", "MotifTotal", "Lengths"])
+MotifLength = namedtuple("MotifLength", ["Codes", "CanonicalCodes", "SequenceIndex",
+                                         "MotifIndex"])
+
+#This compiles motif sets into a motif matcher. Whatever the number of motifs, each protein
+#is then scanned once for each motif length.
+def compileMotifs(MotifSets):
+    """Function for compiling motif sets into a motif matcher"""
+    Sequences = {}
+    motifIndex = 0
+    for Set in MotifSets:
+        for motif in Set.Motifs:
+            for sequence in expandMotif(motif):
+                Sequences.setdefault(len(sequence), []).append((sequence, motifIndex))
+            motifIndex += 1
+
+    Lengths = {}
+    for length, Pairs in Sequences.items():
+        sequenceList = sorted(set(sequence for sequence, i in Pairs),
+                              key=lambda sequence: sequenceCode(sequence, KmerBase))
+        position = dict((sequence, i) for i, sequence in enumerate(sequenceList))
+        Lengths[length] = MotifLength(
+            numpy.array([sequenceCode(i, KmerBase) for i in sequenceList], dtype=numpy.int64),
+            numpy.array([sequenceCode(i, len(AAList)) for i in sequenceList],
+                        dtype=numpy.int64),
+            numpy.array([position[sequence] for sequence, i in Pairs], dtype=numpy.intp),
+            numpy.array([i for sequence, i in Pairs], dtype=numpy.intp))
+    return MotifMatcher(MotifSets, motifIndex, Lengths)
+
+#This turns an amino acid sequence into its k-mer code (base 21 for kmerCodes(), base 20
+#for the AA and di-AA counts of a protein record).
+def sequenceCode(sequence, base):
+    """Function for turning an amino acid sequence into a k-mer code"""
+    code = 0
+    for AA in sequence:
+        code = code * base + AAIndex[AA]
+    return code
+
+#Motifs of 1 or 2 amino acids can be counted from the AA and di-AA counts of a protein
+#record, without scanning the protein again.
+def needsScan(Matcher):
+    """Function for checking whether a matcher has motifs longer than 2 amino acids"""
+    return any(length > 2 for length in Matcher.Lengths)
+
+#This adds up the counts of each sequence into the motif columns it belongs to.
+def motifTotals(Matcher, length, SequenceCounts):
+    """Function for totalling sequence counts into motif counts"""
+    Length = Matcher.Lengths[length]
+    return numpy.bincount(Length.MotifIndex, weights=SequenceCounts[Length.SequenceIndex],
+                          minlength=Matcher.MotifTotal)
+
+#This counts every overlapping hit of every motif of a matcher in an encoded protein. Each
+#motif length is one pass over the protein's k-mer codes: short motifs are read out of a
+#bincount of the codes, and longer ones are looked up in the sorted table of motif codes.
+def scanMotifs(EncodedProtein, Matcher):
+    """Function for counting the motifs of a matcher in an encoded protein"""
+    MotifCounts = numpy.zeros(Matcher.MotifTotal)
+    for length, Length in Matcher.Lengths.items():
+        codes = kmerCodes(EncodedProtein, length)
+        if length <= DenseKmerSize:
+            SequenceCounts = numpy.bincount(codes, minlength=KmerBase ** length)[Length.Codes]
+        else:
+            SequenceCounts = numpy.bincount(matchedPositions(Length.Codes, codes),
+                                            minlength=len(Length.Codes))
+        MotifCounts += motifTotals(Matcher, length, SequenceCounts)
+    return MotifCounts.astype(numpy.uint32)
+
+#This finds which entry of a sorted table of motif codes each k-mer code is, and which of
+#the k-mers are one of the motif sequences at all.
+def findMotifCodes(MotifCodes, codes):
+    """Function for looking up k-mer codes in a sorted table of motif codes"""
+    positions = numpy.searchsorted(MotifCodes, codes)
+    found = positions < len(MotifCodes)
+    found[found] = MotifCodes[positions[found]] == codes[found]
+    return positions, found
+
+#This finds which entry of a sorted table of motif codes each k-mer code is, keeping only
+#the k-mers that are one of the motif sequences.
+def matchedPositions(MotifCodes, codes):
+    """Function for listing the motif table entries of the k-mer codes that are motifs"""
+    positions, found = findMotifCodes(MotifCodes, codes)
+    return positions[found]
+
+#This counts the motif hits of a given length that start at each position of an encoded
+#protein (e.g., for D[GS] and DG, a DG counts twice where it starts).
+def motifHits(EncodedProtein, Matcher, length):
+    """Function for counting the motif hits starting at each position of a protein"""
+    Length = Matcher.Lengths[length]
+    MotifsPerSequence = numpy.bincount(Length.SequenceIndex, minlength=len(Length.Codes))
+    positions, found = findMotifCodes(Length.Codes, kmerCodes(EncodedProtein, length))
+    hits = numpy.zeros(len(EncodedProtein), dtype=numpy.int64)
+    hits[numpy.flatnonzero(found)] = MotifsPerSequence[positions[found]]
+    return hits
+
+#This gives the motif counts of a protein record: the counts found by scanMotifs() while
+#the protein was read, or else the counts worked out from its AA and di-AA counts.
+def recordMotifCounts(Record, Matcher):
+    """Function for finding the motif counts of a protein record"""
+    if Record.MotifCounts is not None:
+        return Record.MotifCounts
+    MotifCounts = numpy.zeros(Matcher.MotifTotal)
+    for length, Length in Matcher.Lengths.items():
+        Counts = Record.AACounts if length == 1 else Record.DiPeptideMatrix.ravel()
+        MotifCounts += motifTotals(Matcher, length, Counts[Length.CanonicalCodes])
+    return MotifCounts.astype(numpy.uint32)
+
+#This finds where the columns of each motif set start and end among all of the motifs.
+def motifSetColumns(Matcher):
+    """Function for listing the (first, last + 1) motif column of each motif set"""
+    Columns = []
+    first = 0
+    for Set in Matcher.MotifSets:
+        Columns.append((first, first + len(Set.Motifs)))
+        first += len(Set.Motifs)
+    return Columns
+
+#The motif matcher of the motif sets that Paacman has always counted.
+DefaultMotifMatcher = compileMotifs(DefaultMotifSets)
@@ -0,0 +1,179 @@
+#Protein amino acid composition analysis = Paacman
+#Reading, counting and writing the Excel file at the same time (--pipeline). The stages are
+#joined by bounded queues, so only a few parts of proteins are ever held in memory however
+#many proteins the folder holds.
+
+import threading
+import Queue
+from collections import deque
+from functools import partial
+from itertools import islice
+
+from paacman.fasta import readFileSequences
+from paacman.counting import ProteinChunkSize, analyzeProtein, totalRecord
+from paacman.records import ProteinTable
+from paacman.motifs import DefaultMotifMatcher
+from paacman.workbook import partTitle, proteinsPerWorkbook, writeWorkbook
+from paacman.profiling import countedSequences, stage, timedSequences
+
+#Number of FASTA files read ahead by reader threads, and number of proteins each reader may
+#hold before it waits for them to be counted.
+PrefetchFiles = 4
+PrefetchProteins = 256
+
+#Number of chunks of proteins (of ProteinChunkSize) that each counting process may have
+#waiting to be counted or waiting to be written.
+PendingChunksPerJob = 2
+
+#Marks the end of a file's proteins in its reader's queue.
+EndOfFile = object()
+
+#This reads the proteins of one FASTA file into a queue, followed by EndOfFile. Anything that
+#goes wrong while reading is put into the queue as well, to be raised where it is read.
+def readIntoQueue(File, FileQueue):
+    """Function for reading the proteins of a FASTA file into a queue"""
+    try:
+        for ProteinSequence in readFileSequences(File):
+            FileQueue.put(ProteinSequence)
+    except Exception as error:
+        FileQueue.put(error)
+    FileQueue.put(EndOfFile)
+
+#This starts a reader thread for a FASTA file and gives the queue it reads into.
+def startReader(File, proteins=PrefetchProteins):
+    """Function for reading a FASTA file in a thread of its own"""
+    FileQueue = Queue.Queue(proteins)
+    reader = threading.Thread(target=readIntoQueue, args=(File, FileQueue))
+    reader.daemon = True
+    reader.start()
+    return FileQueue
+
+#This reads the proteins of FASTA files in the same order as readProteinSequences(), while
+#reader threads read the next files ahead (e.g., from a network drive) during the counting.
+def prefetchedSequences(Files, files=PrefetchFiles, proteins=PrefetchProteins):
+    """Generator for the (protein name, normalized sequence) of each protein in the files"""
+    Files = iter(Files)
+    Readers = deque(startReader(File, proteins) for File in islice(Files, files))
+    while Readers:
+        FileQueue = Readers.popleft()
+        for File in islice(Files, 1):
+            Readers.append(startReader(File, proteins))
+        while True:
+            ProteinSequence = FileQueue.get()
+            if ProteinSequence is EndOfFile:
+                break
+            if isinstance(ProteinSequence, Exception):
+                raise ProteinSequence
+            yield ProteinSequence
+
+#This counts a chunk of (protein name, sequence) pairs in a counting process.
+def countChunk(ProteinSequences, kmerSizes=(), Matcher=None, Windows=None):
+    """Function for building the protein records of a chunk of proteins"""
+    return [analyzeProtein(ProteinName, ProteinRead, kmerSizes, Matcher, Windows)
+            for ProteinName, ProteinRead in ProteinSequences]
+
+#This counts (protein name, sequence) pairs in order, one record at a time. With more than 1
+#job, chunks of proteins are handed out to a pool of processes, but only a few chunks per
+#process are sent ahead of the records taken so far, so that a slow writer holds back the
+#reading instead of letting the proteins pile up in memory.
+def countedRecords(ProteinSequences, jobs=1, kmerSizes=(), Matcher=None, Windows=None):
+    """Generator for the protein records of (protein name, sequence) pairs"""
+    if jobs == 1:
+        for ProteinName, ProteinRead in ProteinSequences:
+            yield analyzeProtein(ProteinName, ProteinRead, kmerSizes, Matcher, Windows)
+        return
+    import multiprocessing #Only needed when counting with more than 1 process.
+    pool = multiprocessing.Pool(jobs)
+    counter = partial(countChunk, kmerSizes=kmerSizes, Matcher=Matcher, Windows=Windows)
+    Pending = deque()
+    ProteinSequences = iter(ProteinSequences)
+    try:
+        while True:
+            Chunk = list(islice(ProteinSequences, ProteinChunkSize))
+            if Chunk:
+                Pending.append(pool.apply_async(counter, (Chunk,)))
+            if not Pending:
+                break
+            if not Chunk or len(Pending) >= jobs * PendingChunksPerJob:
+                for Record in Pending.popleft().get():
+                    yield Record
+    finally:
+        pool.terminate()
+        pool.join()
+
+#This writes the workbooks put into a queue, one at a time and in order, until it is given
+#None. If a workbook can't be written, the rest of the queue is taken but not written, and
+#the error is kept in Errors for the pipeline to raise.
+def writeQueuedWorkbooks(WorkbookQueue, writeOnly, formulas, Matcher, Errors):
+    """Function for writing the workbooks of a queue in the Excel writer thread"""
+    while True:
+        Workbook = WorkbookQueue.get()
+        if Workbook is None:
+            return
+        if not Errors:
+            try:
+                writeWorkbook(Workbook[0], Workbook[1], writeOnly, formulas, Matcher)
+            except Exception as error:
+                Errors.append(error)
+
+#This reads, counts and writes the proteins of FASTA files into the output Excel file as a
+#pipeline: reader threads read the files ahead, the proteins are counted (by a pool of
+#processes with more than 1 job) and a single writer thread writes each part of the output
+#as soon as it is full, in the same order as writeWorkbooks(). The proteins are written
+#into parts of at most maxProteins (or as many as Excel allows), along with the summary of
+#every part, or into outName.xlsx when they fit into one part. Only the part being filled,
+#the part waiting for the writer and the part being written are held in memory.
+def writePipeline(Files, outName, jobs=1, writeOnly=False, formulas=True,
+                  Matcher=DefaultMotifMatcher, maxProteins=None, scanMatcher=None):
+    """Function for reading, counting and writing the proteins of FASTA files at once"""
+    partSize = proteinsPerWorkbook(Matcher)
+    if maxProteins is not None:
+        partSize = min(partSize, maxProteins)
+    WorkbookQueue = Queue.Queue(1)
+    Errors = []
+    writer = threading.Thread(target=writeQueuedWorkbooks,
+                              args=(WorkbookQueue, writeOnly, formulas, Matcher, Errors))
+    writer.daemon = True
+    writer.start()
+    
+    outFiles = []
+    SummaryRecords = []
+    PartRecords = ProteinTable()
+    first = 0
+    try:
+        with stage("count") as Counts:
+            ProteinSequences = countedSequences(
+                Counts, timedSequences("read FASTA", prefetchedSequences(Files)))
+            for Record in countedRecords(ProteinSequences, jobs, Matcher=scanMatcher):
+                if len(PartRecords) == partSize:
+                    partName = outName + " part " + str(len(outFiles) + 1)
+                    SummaryRecords.append(totalRecord(partTitle(len(outFiles) + 1, first,
+                                                                len(PartRecords)), PartRecords))
+                    WorkbookQueue.put((PartRecords, partName))
+                    outFiles.append(partName + ".xlsx")
+                    first += len(PartRecords)
+                    PartRecords = ProteinTable()
+                PartRecords.append(Record)
+        
+        #Writes the last part, or the only workbook when every protein fit into one.
+        if outFiles:
+            partName = outName + " part " + str(len(outFiles) + 1)
+            SummaryRecords.append(totalRecord(partTitle(len(outFiles) + 1, first,
+                                                        len(PartRecords)), PartRecords))
+            WorkbookQueue.put((PartRecords, partName))
+            outFiles.append(partName + ".xlsx")
+        elif PartRecords:
+            WorkbookQueue.put((PartRecords, outName))
+            outFiles.append(outName + ".xlsx")
+    finally:
+        with stage("write xlsx parts"):
+            WorkbookQueue.put(None)
+            writer.join()
+    if Errors:
+        raise Errors[0]
+    
+    if SummaryRecords:
+        with stage("write xlsx summary", first + len(PartRecords)):
+            writeWorkbook(SummaryRecords, outName + " summary", writeOnly, formulas, Matcher)
+        outFiles.append(outName + " summary.xlsx")
+    return outFiles
@@ -0,0 +1,208 @@
+#Protein amino acid composition analysis = Paacman
+#Per-stage timing of a Paacman run (--profile), which can also be turned on from Python:
+#    from paacman import profiling
+#    profiling.startProfiling()
+#    ...
+#    Report = profiling.stopProfiling()
+
+from contextlib import contextmanager
+import json
+import resource
+import threading
+import time
+
+#Stage timings of the run being profiled, or None when Paacman isn't being profiled. Each
+#stage is saved under its name as a dictionary of seconds, calls, proteins and residues.
+Stages = None
+
+#Settings of the run being profiled: a function called after each stage, the name of the
+#stage to capture with cProfile/tracemalloc, and the stages that are currently running in
+#each thread (e.g., the Excel writer of --pipeline runs its stages in a thread of its own).
+StageHook = None
+HotStage = None
+HotProfiler = None
+RunningThreads = threading.local()
+StageLock = threading.Lock()
+StartTime = None
+
+#This starts recording stage timings. hook is called as hook(stage name, seconds, proteins,
+#residues) every time a stage finishes. hotStage names a stage (e.g., "count") to be
+#captured with cProfile, and with tracemalloc when it is installed.
+def startProfiling(hook=None, hotStage=None):
+    """Function for turning on the stage timings of Paacman"""
+    global Stages, StageHook, HotStage, HotProfiler, RunningThreads, StartTime
+    Stages = {}
+    StageHook = hook
+    HotStage = hotStage
+    HotProfiler = None
+    RunningThreads = threading.local()
+    StartTime = time.time()
+    if hotStage is not None:
+        import cProfile
+        HotProfiler = {"profiler": cProfile.Profile(), "tracemalloc": importTracemalloc(),
+                       "peak_memory_bytes": 0}
+
+#tracemalloc was only added in Python 3.4, so it is only used when a backport is installed.
+def importTracemalloc():
+    """Function for importing tracemalloc, or None if it isn't installed"""
+    try:
+        import tracemalloc
+    except ImportError:
+        return None
+    return tracemalloc
+
+#This finds the most memory Paacman has used so far. Linux reports it in kB.
+def peakMemory():
+    """Function for finding the peak resident memory (MB) of Paacman"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+#This gives the stages running in the current thread, innermost last.
+def runningStages():
+    """Function for finding the stages running in the current thread"""
+    return RunningThreads.__dict__.setdefault("RunningStages", [])
+
+#This adds time, calls, proteins and residues to a stage. The time of a stage never
+#includes the time of stages running inside it (e.g., reading FASTA files while counting).
+def addStage(name, seconds=0.0, calls=0, proteins=0, residues=0):
+    """Function for adding to the totals of a profiled stage"""
+    with StageLock:
+        Stage = Stages.setdefault(name, {"seconds": 0.0, "calls": 0, "proteins": 0,
+                                         "residues": 0, "peak_rss_mb": 0.0})
+        Stage["seconds"] += seconds
+        Stage["calls"] += calls
+        Stage["proteins"] += proteins
+        Stage["residues"] += residues
+    return Stage
+
+#This times a stage of Paacman, e.g. "with stage('write xlsx'):". The stage's proteins and
+#residues can be added to the dictionary that it hands out while it runs. Nothing is
+#recorded unless profiling has been started.
+@contextmanager
+def stage(name, proteins=0, residues=0):
+    """Context manager for timing a stage of Paacman"""
+    Counts = {"proteins": proteins, "residues": residues}
+    if Stages is None:
+        yield Counts
+        return
+    hot = name == HotStage and HotProfiler is not None
+    if hot:
+        startHotStage()
+    RunningStages = runningStages()
+    RunningStages.append(0.0) #Time spent in stages running inside of this one.
+    start = time.time()
+    try:
+        yield Counts
+    finally:
+        seconds = time.time() - start
+        innerSeconds = RunningStages.pop()
+        if RunningStages:
+            RunningStages[-1] += seconds
+        if hot:
+            stopHotStage()
+        Stage = addStage(name, seconds - innerSeconds, 1, Counts["proteins"],
+                         Counts["residues"])
+        Stage["peak_rss_mb"] = peakMemory()
+        if StageHook is not None:
+            StageHook(name, seconds - innerSeconds, Counts["proteins"], Counts["residues"])
+
+#This adds the proteins and residues of a (protein name, sequence) generator to the counts
+#of a stage as they're taken from it.
+def countedSequences(Counts, ProteinSequences):
+    """Generator for counting the proteins and residues taken from a generator"""
+    for ProteinSequence in ProteinSequences:
+        Counts["proteins"] += 1
+        Counts["residues"] += len(ProteinSequence[1])
+        yield ProteinSequence
+
+#These turn cProfile (and tracemalloc) on and off around the hot stage.
+def startHotStage():
+    """Function for starting cProfile/tracemalloc on the hot stage"""
+    if HotProfiler["tracemalloc"] is not None and not HotProfiler["tracemalloc"].is_tracing():
+        HotProfiler["tracemalloc"].start()
+    HotProfiler["profiler"].enable()
+
+def stopHotStage():
+    """Function for stopping cProfile/tracemalloc on the hot stage"""
+    HotProfiler["profiler"].disable()
+    if HotProfiler["tracemalloc"] is not None:
+        HotProfiler["peak_memory_bytes"] = max(HotProfiler["peak_memory_bytes"],
+                                               HotProfiler["tracemalloc"].get_traced_memory()[1])
+        HotProfiler["tracemalloc"].stop()
+
+#This times each protein taken from a (protein name, sequence) generator as part of a stage,
+#so that reading the FASTA files is timed apart from counting the proteins they're read into.
+#With --jobs the proteins are read by a thread of the process pool, alongside the counting,
+#so their time is only taken out of a surrounding stage running in the same thread.
+def timedSequences(name, ProteinSequences):
+    """Generator for timing the proteins read from a (protein name, sequence) generator"""
+    if Stages is None:
+        for ProteinSequence in ProteinSequences:
+            yield ProteinSequence
+        return
+    ProteinSequences = iter(ProteinSequences)
+    while True:
+        start = time.time()
+        try:
+            ProteinSequence = next(ProteinSequences)
+        except StopIteration:
+            addStage(name, time.time() - start)
+            return
+        seconds = time.time() - start
+        RunningStages = runningStages()
+        if RunningStages:
+            RunningStages[-1] += seconds
+        addStage(name, seconds, 1, 1, len(ProteinSequence[1]))
+        yield ProteinSequence
+
+#This lists the functions that took the most time within the hot stage.
+def hotFunctions(limit=25):
+    """Function for summarizing the cProfile capture of the hot stage"""
+    import pstats
+    Statistics = pstats.Stats(HotProfiler["profiler"]).stats
+    Functions = []
+    for (fileName, lineNum, function), (primitiveCalls, calls, ownTime, cumulativeTime,
+                                         callers) in Statistics.items():
+        Functions.append({"function": function, "file": fileName, "line": lineNum,
+                          "calls": calls, "own_seconds": ownTime,
+                          "cumulative_seconds": cumulativeTime})
+    Functions.sort(key=lambda Function: Function["own_seconds"], reverse=True)
+    return Functions[:limit]
+
+#This stops recording stage timings and returns them as a report, with the proteins and
+#residues per second of each stage.
+def stopProfiling():
+    """Function for turning off the stage timings and building the profile report"""
+    global Stages
+    Report = {"total_seconds": time.time() - StartTime, "peak_rss_mb": peakMemory(),
+              "stages": []}
+    for name in sorted(Stages, key=lambda name: -Stages[name]["seconds"]):
+        Stage = dict(Stages[name], stage=name)
+        Stage["proteins_per_second"] = (Stage["proteins"] / Stage["seconds"]
+                                        if Stage["seconds"] and Stage["proteins"] else None)
+        Stage["residues_per_second"] = (Stage["residues"] / Stage["seconds"]
+                                        if Stage["seconds"] and Stage["residues"] else None)
+        Report["stages"].append(Stage)
+    if HotProfiler is not None:
+        Report["hot_stage"] = {"stage": HotStage, "functions": hotFunctions()}
+        if HotProfiler["tracemalloc"] is not None:
+            Report["hot_stage"]["peak_traced_memory_bytes"] = HotProfiler["peak_memory_bytes"]
+    Stages = None
+    return Report
+
+#This saves a profile report as a JSON file.
+def writeProfile(Report, fileName):
+    """Function for saving a profile report as JSON"""
+    with open(fileName, "w") as outFile:
+        json.dump(Report, outFile, indent=2, sort_keys=True)
+
+#This prints where the time of a profiled run went.
+def printProfile(Report):
+    """Function for printing a profile report as a table"""
+    print "%-44s %10s %8s %12s %14s" % ("Stage", "Seconds", "Calls", "Proteins/s",
+                                         "Residues/s")
+    for Stage in Report["stages"]:
+        print "%-44s %10.3f %8d %12.0f %14.0f" % (Stage["stage"], Stage["seconds"],
+                                                 Stage["calls"],
+                                                 Stage["proteins_per_second"] or 0,
+                                                 Stage["residues_per_second"] or 0)
+    print "%-44s %10.3f" % ("Total", Report["total_seconds"])
@@ -0,0 +1,153 @@
+#Protein amino acid composition analysis = Paacman
+#Protein records, and the table that keeps the counts of every protein of a run in one place.
+
+import numpy #Needs to be installed by the user!
+from collections import namedtuple
+
+from paacman.aminoacids import AAList
+
+#This stores everything Paacman needs to know about a protein, so that each FASTA file
+#only has to be read once. AACounts is in AAList order and DiPeptideMatrix is laid out
+#like AllDiPeptideList (DiPeptideMatrix[1st AA, 2nd AA]). KmerCounts holds the counts of
+#any longer k-mers asked for (k -> kmerCounts()), MotifCounts the counts of the motifs of
+#a motif matcher with motifs longer than 2 amino acids and WindowCounts the sliding-window
+#profiles of windowCounts(); each is None when not asked for. ProteinLength is the number of
+#residues of the sequence, non-canonical ones included, or None when the record wasn't built
+#from a sequence (e.g., totals, or counts read back from a file).
+ProteinRecord = namedtuple("ProteinRecord", ["ProteinName", "AACounts", "DiPeptideMatrix",
+                                             "KmerCounts", "MotifCounts", "WindowCounts",
+                                             "ProteinLength"])
+ProteinRecord.__new__.__defaults__ = (None, None, None, None)
+
+#Number of proteins a protein table makes room for when it first fills up.
+TableStartSize = 1024
+
+#This copies a count block into a larger one with room for capacity proteins.
+def grownBlock(Block, capacity):
+    """Function for making room for more proteins in a count block"""
+    Grown = numpy.zeros((capacity,) + Block.shape[1:], dtype=Block.dtype)
+    Grown[:len(Block)] = Block
+    return Grown
+
+#This holds the protein records of a run as one N x 20 block of AA counts and one
+#N x 20 x 20 block of di-AA counts (uint32), instead of two small arrays per protein, so that
+#the counts of a million proteins take about 1.7 GB and can be totalled or sorted as whole
+#matrices. It can be used like a list of protein records:
+#len(), iteration, Table[i] and Table[first:last] give protein records (or a protein table)
+#whose counts are views of the blocks.
+class ProteinTable(object):
+    """Class for the protein records of a run, stored in contiguous count blocks"""
+    __slots__ = ("ProteinNames", "AAMatrix", "DiAAMatrix", "KmerCounts", "MotifCounts",
+                 "WindowCounts", "ProteinLengths", "size")
+
+    def __init__(self, capacity=0):
+        self.ProteinNames = []
+        self.AAMatrix = numpy.zeros((capacity, len(AAList)), dtype=numpy.uint32)
+        self.DiAAMatrix = numpy.zeros((capacity, len(AAList), len(AAList)), dtype=numpy.uint32)
+        self.KmerCounts = []
+        self.MotifCounts = []
+        self.WindowCounts = []
+        self.ProteinLengths = []
+        self.size = 0
+
+    #The count blocks double in size whenever they fill up, so that adding a protein takes the
+    #same time on average however many proteins the table holds.
+    def append(self, Record):
+        """Function for adding a protein record to the end of the table"""
+        if self.size == len(self.AAMatrix):
+            capacity = max(2 * self.size, TableStartSize)
+            self.AAMatrix = grownBlock(self.AAMatrix, capacity)
+            self.DiAAMatrix = grownBlock(self.DiAAMatrix, capacity)
+        self.AAMatrix[self.size] = Record.AACounts
+        self.DiAAMatrix[self.size] = Record.DiPeptideMatrix
+        self.ProteinNames.append(Record.ProteinName)
+        self.KmerCounts.append(Record.KmerCounts)
+        self.MotifCounts.append(Record.MotifCounts)
+        self.WindowCounts.append(Record.WindowCounts)
+        self.ProteinLengths.append(Record.ProteinLength)
+        self.size += 1
+
+    #This gives the protein records of the rows of the table (e.g., to sort the proteins, or
+    #to hand one protein's counts out to several proteins with the same sequence) as a new
+    #table, named ProteinNames when given.
+    def take(self, rows, ProteinNames=None):
+        """Function for building a protein table from some of the rows of this one"""
+        rows = numpy.asarray(rows, dtype=numpy.intp)
+        Table = ProteinTable()
+        Table.AAMatrix = self.AAMatrix[:self.size][rows]
+        Table.DiAAMatrix = self.DiAAMatrix[:self.size][rows]
+        Table.ProteinNames = (list(ProteinNames) if ProteinNames is not None
+                              else [self.ProteinNames[i] for i in rows])
+        Table.KmerCounts = [self.KmerCounts[i] for i in rows]
+        Table.MotifCounts = [self.MotifCounts[i] for i in rows]
+        Table.WindowCounts = [self.WindowCounts[i] for i in rows]
+        Table.ProteinLengths = [self.ProteinLengths[i] for i in rows]
+        Table.size = len(rows)
+        return Table
+
+    #This gives the N x 20 AA count matrix and the N x 400 di-AA count matrix of the table,
+    #whose columns are in the same order as AAList and DiPeptideColumns.
+    def countMatrices(self):
+        """Function for giving the count blocks of the table as N x 20 and N x 400 matrices"""
+        return (self.AAMatrix[:self.size],
+                self.DiAAMatrix[:self.size].reshape(self.size, len(AAList) ** 2))
+
+    def record(self, i):
+        """Function for giving one row of the table as a protein record"""
+        return ProteinRecord(self.ProteinNames[i], self.AAMatrix[i], self.DiAAMatrix[i],
+                             self.KmerCounts[i], self.MotifCounts[i], self.WindowCounts[i],
+                             self.ProteinLengths[i])
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for i in xrange(self.size):
+            yield self.record(i)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.take(range(*i.indices(self.size)))
+        if i < 0:
+            i += self.size
+        if not 0 <= i < self.size:
+            raise IndexError("protein table index out of range")
+        return self.record(i)
+
+    #Protein tables are handed to other processes (e.g., when writing Excel parts with
+    #--jobs) without their unused room.
+    def __getstate__(self):
+        return (self.ProteinNames, self.AAMatrix[:self.size], self.DiAAMatrix[:self.size],
+                self.KmerCounts, self.MotifCounts, self.WindowCounts, self.ProteinLengths,
+                self.size)
+
+    def __setstate__(self, state):
+        (self.ProteinNames, self.AAMatrix, self.DiAAMatrix, self.KmerCounts,
+         self.MotifCounts, self.WindowCounts, self.ProteinLengths, self.size) = state
+
+#This gathers protein records (e.g., from a list) into a protein table.
+def proteinTable(ProteinRecords):
+    """Function for building a protein table from protein records"""
+    if isinstance(ProteinRecords, ProteinTable):
+        return ProteinRecords
+    Table = ProteinTable()
+    for Record in ProteinRecords:
+        Table.append(Record)
+    return Table
+
+#This builds a protein table from count blocks that are already stacked (e.g., read back from
+#a file), with the motif counts of each protein as the rows of MotifMatrix when given.
+def tableFromBlocks(ProteinNames, AAMatrix, DiAAMatrix, MotifMatrix=None):
+    """Function for building a protein table from its AA and di-AA count blocks"""
+    Table = ProteinTable()
+    Table.ProteinNames = list(ProteinNames)
+    Table.AAMatrix = numpy.ascontiguousarray(AAMatrix, dtype=numpy.uint32)
+    Table.DiAAMatrix = numpy.ascontiguousarray(DiAAMatrix, dtype=numpy.uint32).reshape(
+        len(AAMatrix), len(AAList), len(AAList))
+    Table.KmerCounts = [None] * len(AAMatrix)
+    Table.MotifCounts = (list(MotifMatrix) if MotifMatrix is not None
+                         else [None] * len(AAMatrix))
+    Table.WindowCounts = [None] * len(AAMatrix)
+    Table.ProteinLengths = [None] * len(AAMatrix)
+    Table.size = len(AAMatrix)
+    return Table
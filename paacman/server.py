@@ -0,0 +1,293 @@
+#Protein amino acid composition analysis = Paacman
+#Runs Paacman as a local service, e.g. "python -m paacman.server --port 8765", which counts
+#sequences sent to it and writes the Excel file of a folder on request, keeping the parsed
+#FASTA files, the count cache and openpyxl loaded between requests.
+#    curl --data-binary @Protein1.txt http://localhost:8765/compose
+#    curl -d '{"folder": "/data/batch7"}' http://localhost:8765/workbook
+
+import numpy #Needs to be installed by the user!
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from collections import OrderedDict
+import ConfigParser
+import BaseHTTPServer
+import SocketServer
+from StringIO import StringIO
+
+from paacman.aminoacids import AAList
+from paacman.fasta import fastaFiles, readFasta, readFileSequences, proteinNameFromHeader
+from paacman.counting import analyzeProtein
+from paacman.cache import cachedProteins
+from paacman.duplicates import sharedRecords, uniqueSequences
+from paacman.motifs import (DefaultMotifMatcher, compileMotifs, motifSetColumns, needsScan,
+                            readMotifSets, recordMotifCounts)
+from paacman.workbook import writeWorkbooks #Loads openpyxl once, when the service starts.
+
+#The service only listens on this computer.
+ServerHost = "127.0.0.1"
+
+#Requests larger than this many bytes are turned away.
+MaxRequestSize = 64 * 1024 * 1024
+
+#Number of sequences whose counts the service keeps (about 2 KB each) before it forgets the
+#ones that were least recently used.
+MaxCachedSequences = 250000
+
+#This reads the proteins of a request, which is either FASTA text (one or more proteins) or a
+#bare protein sequence, named "sequence".
+def requestProteins(body):
+    """Function for reading the (protein name, normalized sequence) pairs of a request"""
+    if not body.lstrip().startswith(">"):
+        body = ">sequence\n" + body
+    ProteinSequences = [(proteinNameFromHeader(header) or "sequence", ProteinRead)
+                        for header, ProteinRead in readFasta(StringIO(body))]
+    if not ProteinSequences:
+        raise ValueError("The request holds no protein sequence.")
+    return ProteinSequences
+
+#This gives the motif counts of a protein record as {motif set title: {motif: count}}.
+def motifCountsBySet(Record, Matcher):
+    """Function for laying out the motif counts of a protein record by motif set"""
+    MotifCounts = recordMotifCounts(Record, Matcher).tolist()
+    return dict((Set.Title, dict(zip(Set.Motifs, MotifCounts[first:last])))
+                for Set, (first, last) in zip(Matcher.MotifSets, motifSetColumns(Matcher)))
+
+#This turns a protein record into the JSON reply of a request. AA counts are in AAList order
+#and di-AA counts are laid out like AllDiPeptideList (counts[1st AA][2nd AA]).
+def recordReply(Record, Matcher, parts):
+    """Function for building the JSON reply for one protein record"""
+    Reply = {"name": Record.ProteinName}
+    if "compose" in parts:
+        Reply["amino_acids"] = Record.AACounts.tolist()
+    if "dipeptides" in parts:
+        Reply["dipeptides"] = Record.DiPeptideMatrix.tolist()
+    if "motifs" in parts:
+        Reply["motifs"] = motifCountsBySet(Record, Matcher)
+    return Reply
+
+#The parts of a protein's counts that each counting request replies with.
+RequestParts = {"/compose": ["compose"], "/dipeptides": ["dipeptides"],
+                "/motifs": ["motifs"], "/analyze": ["compose", "dipeptides", "motifs"]}
+
+#This holds everything the service keeps loaded between requests: the parsed proteins of each
+#FASTA file (with the file's size and modification time, so changed files are read again),
+#the count cache of the maxCached sequences counted most recently and the motif matcher.
+#Parsed files are forgotten once they are gone from their folder.
+class PaacmanService(object):
+    """Class for the warm state of the Paacman service"""
+    def __init__(self, Matcher=DefaultMotifMatcher, jobs=1, maxCached=MaxCachedSequences):
+        self.Matcher = Matcher
+        self.jobs = jobs
+        self.maxCached = maxCached
+        self.ParsedFiles = {}
+        self.Cache = OrderedDict()
+        self.lock = threading.Lock()
+
+    #This reads the proteins of a FASTA file, or reuses them if the file hasn't changed.
+    def fileSequences(self, File):
+        """Function for reading a FASTA file through the parsed file cache"""
+        File = os.path.abspath(File)
+        status = os.stat(File)
+        stamp = (status.st_size, status.st_mtime)
+        if File not in self.ParsedFiles or self.ParsedFiles[File][0] != stamp:
+            self.ParsedFiles[File] = (stamp, list(readFileSequences(File)))
+        return self.ParsedFiles[File][1]
+
+    #This lists the FASTA files of a folder, forgetting the parsed proteins of any file that
+    #was in the folder before but is gone now.
+    def folderFiles(self, folder):
+        """Function for listing the FASTA files of a folder through the parsed file cache"""
+        Files = fastaFiles(folder)
+        folderPath = os.path.abspath(folder)
+        current = set(os.path.abspath(File) for File in Files)
+        for File in list(self.ParsedFiles):
+            if os.path.dirname(File) == folderPath and File not in current:
+                del self.ParsedFiles[File]
+        return Files
+
+    #This moves the counts of the sequences used by a request to the recently used end of the
+    #count cache (copying new ones out of the request's count blocks, which would otherwise be
+    #kept in memory with them), then forgets the least recently used sequences over the limit.
+    def keepCounts(self, UsedCache):
+        """Function for updating the count cache with the counts used by a request"""
+        for key, Counts in UsedCache.items():
+            if key in self.Cache:
+                Counts = self.Cache.pop(key)
+            else:
+                Counts = tuple(numpy.array(Count) for Count in Counts)
+            self.Cache[key] = Counts
+        while len(self.Cache) > self.maxCached:
+            self.Cache.popitem(last=False)
+
+    #This counts a single request's proteins, which is quick enough not to need the cache.
+    def countSequences(self, body, parts):
+        """Function for counting the proteins of a request"""
+        Matcher = self.Matcher
+        scanMatcher = Matcher if "motifs" in parts and needsScan(Matcher) else None
+        Records = [analyzeProtein(ProteinName, ProteinRead, Matcher=scanMatcher)
+                   for ProteinName, ProteinRead in requestProteins(body)]
+        return {"amino_acid_order": AAList,
+                "proteins": [recordReply(Record, Matcher, parts) for Record in Records]}
+
+    #This counts every protein of a folder with the warm caches and writes its Excel file
+    #(or files) into the folder, named after the folder as Paacman always has.
+    def writeFolder(self, folder, formulas=True, writeOnly=False):
+        """Function for writing the Excel file of a folder of FASTA files"""
+        if not os.path.isdir(folder):
+            raise ValueError("The folder " + folder + " does not exist.")
+        start = time.time()
+        with self.lock:
+            SequenceNumbers = []
+            UsedCache = {}
+            ProteinSequences = uniqueSequences(
+                (ProteinSequence for File in self.folderFiles(folder)
+                 for ProteinSequence in self.fileSequences(File)), SequenceNumbers)
+            ProteinRecords = sharedRecords(
+                cachedProteins(ProteinSequences, self.jobs, self.Cache, UsedCache,
+                               Matcher=self.Matcher if needsScan(self.Matcher) else None),
+                SequenceNumbers)
+            self.keepCounts(UsedCache)
+        if not ProteinRecords:
+            raise ValueError("There appears to be no FASTA files in the folder " + folder + ".")
+        outName = os.path.join(folder, "AA Analysis for " +
+                               os.path.basename(os.path.abspath(folder)))
+        outFiles = writeWorkbooks(ProteinRecords, outName, writeOnly, formulas, self.Matcher,
+                                  self.jobs)
+        return {"files": outFiles, "proteins": len(ProteinRecords),
+                "seconds": time.time() - start}
+
+    #This gives how much the service has kept loaded.
+    def status(self):
+        """Function for reporting the warm state of the service"""
+        return {"status": "ok", "parsed_files": len(self.ParsedFiles),
+                "cached_sequences": len(self.Cache)}
+
+#This answers the HTTP requests of the service with JSON. Counting requests are POSTs whose
+#body is the FASTA text or sequence; /workbook is a POST of {"folder": ..., "values": ...,
+#"write_only": ...}; GET /status reports the warm state.
+class PaacmanRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Class for answering the HTTP requests of the Paacman service"""
+    def do_GET(self):
+        """Function for answering a GET request"""
+        if self.path == "/status":
+            self.reply(200, self.server.service.status())
+        else:
+            self.reply(404, {"error": "Unknown request " + self.path})
+
+    def do_POST(self):
+        """Function for answering a POST request"""
+        length = int(self.headers.getheader("Content-Length") or 0)
+        if length > MaxRequestSize:
+            self.reply(413, {"error": "The request is too large."})
+            return
+        body = self.rfile.read(length)
+        service = self.server.service
+        try:
+            if self.path in RequestParts:
+                self.reply(200, service.countSequences(body, RequestParts[self.path]))
+            elif self.path == "/workbook":
+                Options = json.loads(body or "{}")
+                if not isinstance(Options, dict):
+                    raise ValueError("The /workbook request must be a JSON object.")
+                folder = Options.get("folder", ".")
+                if not isinstance(folder, basestring):
+                    raise ValueError("The folder of a /workbook request must be a string.")
+                for option in ["values", "write_only"]:
+                    if not isinstance(Options.get(option, False), bool):
+                        raise ValueError("The " + option + " option of a /workbook request "
+                                         "must be true or false.")
+                self.reply(200, service.writeFolder(folder, not Options.get("values", False),
+                                                    Options.get("write_only", False)))
+            else:
+                self.reply(404, {"error": "Unknown request " + self.path})
+        except (ValueError, IOError, OSError) as error:
+            self.reply(400, {"error": str(error)})
+
+    def reply(self, code, Reply):
+        """Function for sending a JSON reply"""
+        data = json.dumps(Reply)
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    #Unix socket clients have no address, so their requests are logged as "local".
+    def log_message(self, format, *args):
+        """Function for logging a request"""
+        client = self.client_address[0] if isinstance(self.client_address, tuple) else "local"
+        sys.stderr.write(client + " - - [" + self.log_date_time_string() + "] " +
+                         format % args + "\n")
+
+#Each request is answered in its own thread, over TCP on this computer or a Unix socket.
+class ThreadingHTTPServer(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    """Class for answering HTTP requests on a port, each in its own thread"""
+    daemon_threads = True
+
+class ThreadingUnixHTTPServer(SocketServer.ThreadingMixIn, SocketServer.UnixStreamServer):
+    """Class for answering HTTP requests on a Unix socket, each in its own thread"""
+    daemon_threads = True
+
+    #HTTPServer needs a server name, which a Unix socket doesn't have.
+    def server_bind(self):
+        """Function for binding the Unix socket"""
+        SocketServer.UnixStreamServer.server_bind(self)
+        self.server_name = "localhost"
+        self.server_port = 0
+
+#This starts the Paacman service and answers requests until it is stopped (Ctrl+C).
+def main():
+    """Function for running the Paacman service from the command line"""
+    parser = argparse.ArgumentParser(
+        description="Run Paacman as a local service with warm caches")
+    parser.add_argument("--port", type=int, default=8765,
+                        help="port to listen on at " + ServerHost + " (default: 8765)")
+    parser.add_argument("--socket", metavar="PATH",
+                        help="listen on a Unix socket instead of a port")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N",
+                        help="number of processes used to count folders and write parts")
+    parser.add_argument("--motifs", metavar="FILE",
+                        help="read the motif sets from a config file (see motifs.ini)")
+    parser.add_argument("--max-cached-sequences", type=int, default=MaxCachedSequences,
+                        metavar="N",
+                        help="number of sequences whose counts are kept between requests, "
+                             "about 2 KB each (default: " + str(MaxCachedSequences) + ")")
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.max_cached_sequences < 0:
+        parser.error("--max-cached-sequences can't be negative")
+    Matcher = DefaultMotifMatcher
+    if args.motifs is not None:
+        try:
+            Matcher = compileMotifs(readMotifSets(args.motifs))
+        except (ValueError, ConfigParser.Error) as error:
+            print error
+            print "Paacman terminated."
+            sys.exit()
+
+    if args.socket is not None:
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
+        server = ThreadingUnixHTTPServer(args.socket, PaacmanRequestHandler)
+        print "Paacman is listening on " + args.socket
+    else:
+        server = ThreadingHTTPServer((ServerHost, args.port), PaacmanRequestHandler)
+        print "Paacman is listening on http://" + ServerHost + ":" + str(args.port)
+    server.service = PaacmanService(Matcher, args.jobs, args.max_cached_sequences)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print ""
+    finally:
+        server.server_close()
+        if args.socket is not None and os.path.exists(args.socket):
+            os.remove(args.socket)
+    print "Paacman has finished!"
+
+if __name__ == "__main__":
+    main()
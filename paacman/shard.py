@@ -0,0 +1,146 @@
+#Protein amino acid composition analysis = Paacman
+#Splitting a run across several computers (--shard i/N). Each shard counts its share of the
+#proteins and saves the counts and names as a partial result, which 'python -m paacman.merge'
+#then combines into the same output files as a run on a single computer.
+
+import numpy #Needs to be installed by the user!
+import os
+
+from paacman.fasta import readFileSequences
+from paacman.counting import countProteins
+from paacman.records import tableFromBlocks
+from paacman.duplicates import sharedRecords, uniqueSequences
+from paacman.motifs import MotifSet
+from paacman.profiling import stage, timedSequences
+
+#How the proteins can be split between the shards: every Nth FASTA file (in numericalSort
+#order) or every Nth protein of all of the files.
+ShardModes = ["files", "records"]
+
+#This reads a shard given as i/N (e.g., 2/8), counting from 1, into (i, N).
+def parseShard(text):
+    """Function for reading a shard number and the number of shards"""
+    try:
+        shard, shards = [int(part) for part in text.split("/")]
+    except ValueError:
+        raise ValueError("A shard is given as i/N (e.g., 2/8), not " + text + ".")
+    if not 1 <= shard <= shards:
+        raise ValueError("A shard must be between 1/N and N/N, not " + text + ".")
+    return shard, shards
+
+#Each shard saves its partial result next to the FASTA files, named after its place.
+def shardName(outName, shard, shards):
+    """Function for naming the partial result of a shard"""
+    return outName + " shard " + str(shard) + " of " + str(shards) + ".npz"
+
+#This reads the proteins of a shard from FASTA files as (file number, protein number within
+#the file, protein name, sequence). With files, the shard reads every Nth file; with
+#records, every file is read but only every Nth protein is kept.
+def shardSequences(Files, shard, shards, mode="files"):
+    """Generator for the proteins of one shard of the FASTA files"""
+    proteinNum = 0
+    for fileNum, File in enumerate(Files):
+        if mode == "files" and fileNum % shards != shard - 1:
+            continue
+        for recordNum, (ProteinName, ProteinRead) in enumerate(readFileSequences(File)):
+            if mode == "files" or proteinNum % shards == shard - 1:
+                yield fileNum, recordNum, ProteinName, ProteinRead
+            proteinNum += 1
+
+#This counts the proteins of a shard into a protein table, keeping where each protein was
+#read from (its file number and number within the file) in Places, so that the shards can
+#be put back in reading order. Proteins with the same sequence are only counted once.
+def countShard(Files, shard, shards, mode="files", jobs=1, Matcher=None, Places=None):
+    """Function for counting the proteins of one shard of the FASTA files"""
+    def placedSequences():
+        for fileNum, recordNum, ProteinName, ProteinRead in shardSequences(Files, shard,
+                                                                           shards, mode):
+            Places.append((fileNum, recordNum))
+            yield ProteinName, ProteinRead
+    if Places is None:
+        Places = []
+    SequenceNumbers = []
+    ProteinSequences = uniqueSequences(timedSequences("read FASTA", placedSequences()),
+                                       SequenceNumbers)
+    ProteinRecords = countProteins(ProteinSequences, jobs, Matcher=Matcher)
+    return sharedRecords(ProteinRecords, SequenceNumbers)
+
+#This counts the proteins of a shard and saves them as a partial result: the counts and
+#names of the proteins, where each was read from, which shard this is out of how many, the
+#FASTA files that were split and the motif sets that were counted. The motif counts are
+#only saved when they had to be scanned for (motifs longer than 2 amino acids).
+def writeShard(Files, outName, shard, shards, mode="files", jobs=1, Matcher=None,
+               scanMatcher=None):
+    """Function for counting one shard of the FASTA files and saving its partial result"""
+    Places = []
+    ProteinRecords = countShard(Files, shard, shards, mode, jobs, scanMatcher, Places)
+    fileName = shardName(outName, shard, shards)
+    with stage("write shard", len(ProteinRecords)):
+        AAMatrix, DiAAMatrix = ProteinRecords.countMatrices()
+        Arrays = dict(ProteinNames=numpy.array(ProteinRecords.ProteinNames, dtype=str),
+                      AAMatrix=AAMatrix, DiAAMatrix=DiAAMatrix,
+                      Places=numpy.array(Places, dtype=numpy.int64).reshape(-1, 2),
+                      Shard=numpy.array([shard, shards]), Mode=numpy.array(mode),
+                      Files=numpy.array([os.path.basename(File) for File in Files], dtype=str),
+                      OutName=numpy.array(os.path.basename(outName)),
+                      Motifs=numpy.array([motif for Set in Matcher.MotifSets
+                                          for motif in Set.Motifs], dtype=str),
+                      MotifSetTitles=numpy.array([Set.Title for Set in Matcher.MotifSets
+                                                  for motif in Set.Motifs], dtype=str))
+        if scanMatcher is not None:
+            Arrays["MotifMatrix"] = numpy.array(
+                ProteinRecords.MotifCounts, dtype=numpy.uint32).reshape(len(ProteinRecords),
+                                                                        Matcher.MotifTotal)
+        numpy.savez(fileName, **Arrays)
+    return fileName
+
+#This loads the partial result of a shard saved by writeShard().
+def loadShard(fileName):
+    """Function for loading the partial result of a shard"""
+    with open(fileName, "rb") as inFile:
+        Arrays = numpy.load(inFile)
+        return dict((field, Arrays[field]) for field in Arrays.files)
+
+#This rebuilds the motif sets that a shard counted from its partial result.
+def shardMotifSets(Partial):
+    """Function for rebuilding the motif sets of a partial result"""
+    MotifSets = []
+    for title, motif in zip(Partial["MotifSetTitles"].tolist(), Partial["Motifs"].tolist()):
+        if not MotifSets or MotifSets[-1].Title != title:
+            MotifSets.append(MotifSet(title, []))
+        MotifSets[-1].Motifs.append(motif)
+    return MotifSets
+
+#This puts the partial results of every shard of a run back together into one protein
+#table, in the order the proteins were read. Every shard from 1 to N must be given once,
+#and all of them must have split the same FASTA files the same way with the same motifs.
+def mergeShards(Partials):
+    """Function for combining the partial results of the shards of a run"""
+    First = Partials[0]
+    shards = int(First["Shard"][1])
+    Shards = sorted(int(Partial["Shard"][0]) for Partial in Partials)
+    if [int(Partial["Shard"][1]) for Partial in Partials] != [shards] * len(Partials):
+        raise ValueError("The partial results are from runs split into different numbers "
+                         "of shards.")
+    if Shards != range(1, shards + 1):
+        missing = sorted(set(range(1, shards + 1)) - set(Shards))
+        raise ValueError("Every shard from 1 to " + str(shards) + " is needed once; " +
+                         ("shard " + ", ".join(str(shard) for shard in missing) + " is missing."
+                          if len(missing) == 1 else
+                          "shards " + ", ".join(str(shard) for shard in missing) +
+                          " are missing." if missing else "a shard was given more than once."))
+    for field in ["Mode", "Files", "Motifs", "MotifSetTitles"]:
+        if any(Partial[field].tolist() != First[field].tolist() for Partial in Partials):
+            raise ValueError("The partial results don't come from the same run (their " +
+                             field + " differ).")
+    if len(set("MotifMatrix" in Partial for Partial in Partials)) > 1:
+        raise ValueError("The partial results don't come from the same run (only some "
+                         "have motif counts).")
+
+    Places = numpy.concatenate([Partial["Places"] for Partial in Partials])
+    order = numpy.lexsort((Places[:, 1], Places[:, 0]))
+    def merged(field):
+        return numpy.concatenate([Partial[field] for Partial in Partials])[order]
+    return tableFromBlocks(merged("ProteinNames").tolist(), merged("AAMatrix"),
+                           merged("DiAAMatrix"),
+                           merged("MotifMatrix") if "MotifMatrix" in First else None)
@@ -0,0 +1,143 @@
+#Protein amino acid composition analysis = Paacman
+#Counting any number of proteins in constant memory (--spill). Only running totals are kept
+#in memory, while the counts of each protein are appended to a spill file on disk, which the
+#Excel output is then written from one part at a time.
+
+import numpy #Needs to be installed by the user!
+import os
+
+from paacman.aminoacids import AAList
+from paacman.records import ProteinRecord, tableFromBlocks
+from paacman.motifs import DefaultMotifMatcher
+from paacman.pipeline import countedRecords, prefetchedSequences
+from paacman.workbook import partTitle, proteinsPerWorkbook, writeWorkbook
+from paacman.profiling import countedSequences, stage, timedSequences
+
+#This is the layout of a protein's row in the spill file: its AA counts, its di-AA counts and,
+#when the motifs are scanned for, its motif counts, all as uint32.
+def spillRowType(motifs=0):
+    """Function for building the NumPy type of a row of the spill file"""
+    Fields = [("AACounts", numpy.uint32, (len(AAList),)),
+              ("DiPeptideMatrix", numpy.uint32, (len(AAList), len(AAList)))]
+    if motifs:
+        Fields.append(("MotifCounts", numpy.uint32, (motifs,)))
+    return numpy.dtype(Fields)
+
+#This holds the spill file of a run: an append-only file of fixed-size count rows along with
+#a file of protein names (one per line), and the running totals of each part of the output,
+#which are all that is kept in memory. Parts hold partSize proteins, as in writeWorkbooks().
+#The names file doesn't end in a FASTA extension, so that one left behind by a run that was
+#killed isn't read as a protein by the next run.
+class SpillFile(object):
+    """Class for the per-protein spill file and running totals of a run"""
+    def __init__(self, fileName, partSize):
+        self.fileName = fileName
+        self.partSize = partSize
+        self.rowType = None
+        self.size = 0
+        self.PartTotals = []
+        self.countFile = open(fileName + ".bin", "wb")
+        self.nameFile = open(fileName + ".names", "wb")
+
+    #This appends a protein's counts to the spill file and adds them to the running totals
+    #of its part.
+    def append(self, Record):
+        """Function for spilling a protein record to disk"""
+        if self.rowType is None:
+            self.rowType = spillRowType(0 if Record.MotifCounts is None
+                                        else len(Record.MotifCounts))
+        if self.size % self.partSize == 0:
+            self.PartTotals.append(ProteinRecord(
+                None, numpy.zeros(len(AAList), dtype=numpy.int64),
+                numpy.zeros((len(AAList), len(AAList)), dtype=numpy.int64),
+                MotifCounts=None if Record.MotifCounts is None
+                            else numpy.zeros(len(Record.MotifCounts), dtype=numpy.int64)))
+        Totals = self.PartTotals[-1]
+        Totals.AACounts[...] += Record.AACounts
+        Totals.DiPeptideMatrix[...] += Record.DiPeptideMatrix
+        self.countFile.write(numpy.asarray(Record.AACounts, dtype=numpy.uint32).tobytes())
+        self.countFile.write(numpy.asarray(Record.DiPeptideMatrix, dtype=numpy.uint32).tobytes())
+        if Record.MotifCounts is not None:
+            Totals.MotifCounts[...] += Record.MotifCounts
+            self.countFile.write(numpy.asarray(Record.MotifCounts, dtype=numpy.uint32).tobytes())
+        self.nameFile.write(Record.ProteinName + "\n")
+        self.size += 1
+
+    def __len__(self):
+        return self.size
+
+    #This reads the spill file back one part at a time, as protein tables of at most
+    #partSize proteins.
+    def parts(self):
+        """Generator for the proteins of each part, read back from the spill file"""
+        self.countFile.flush()
+        self.nameFile.flush()
+        with open(self.fileName + ".bin", "rb") as countFile:
+            with open(self.fileName + ".names", "rb") as nameFile:
+                for first in range(0, self.size, self.partSize):
+                    Rows = numpy.fromfile(countFile, dtype=self.rowType,
+                                          count=min(self.partSize, self.size - first))
+                    ProteinNames = [nameFile.readline()[:-1] for i in range(len(Rows))]
+                    yield tableFromBlocks(ProteinNames, Rows["AACounts"],
+                                          Rows["DiPeptideMatrix"],
+                                          Rows["MotifCounts"] if "MotifCounts" in
+                                          self.rowType.names else None)
+
+    #The spill file is only needed until the output has been written.
+    def remove(self):
+        """Function for closing and deleting the spill file"""
+        self.countFile.close()
+        self.nameFile.close()
+        for File in [self.fileName + ".bin", self.fileName + ".names"]:
+            if os.path.exists(File):
+                os.remove(File)
+
+#This writes the output Excel file from a spill file, the same way as writeWorkbooks(): into
+#outName.xlsx when the proteins fit into one part, or else into parts along with a summary
+#workbook, whose rows are the running totals of the parts. The workbooks are always written
+#in write-only mode, since a regular workbook of a full part takes several GB of memory.
+def writeSpilledWorkbooks(Spill, outName, formulas=True, Matcher=DefaultMotifMatcher):
+    """Function for writing the output Excel files from a spill file"""
+    if len(Spill) <= Spill.partSize:
+        for PartRecords in Spill.parts():
+            writeWorkbook(PartRecords, outName, True, formulas, Matcher)
+        return [outName + ".xlsx"]
+    
+    outFiles = []
+    with stage("write xlsx parts", len(Spill)):
+        for partNum, PartRecords in enumerate(Spill.parts()):
+            partName = outName + " part " + str(partNum + 1)
+            writeWorkbook(PartRecords, partName, True, formulas, Matcher)
+            outFiles.append(partName + ".xlsx")
+    SummaryRecords = []
+    for partNum, Totals in enumerate(Spill.PartTotals):
+        first = partNum * Spill.partSize
+        SummaryRecords.append(Totals._replace(ProteinName=partTitle(
+            partNum + 1, first, min(Spill.partSize, len(Spill) - first))))
+    with stage("write xlsx summary", len(Spill)):
+        writeWorkbook(SummaryRecords, outName + " summary", True, formulas, Matcher)
+    return outFiles + [outName + " summary.xlsx"]
+
+#This reads and counts the proteins of FASTA files into a spill file ("outName spill.bin" and
+#"outName spill.names", deleted once the output is written), keeping only the running
+#totals of each part in memory, and then writes the output Excel file from the spill file.
+#Memory use depends on the part size (maxProteins, or as many proteins as Excel allows),
+#never on the number of proteins.
+def writeSpilled(Files, outName, jobs=1, formulas=True, Matcher=DefaultMotifMatcher,
+                 maxProteins=None, scanMatcher=None):
+    """Function for counting FASTA files into a spill file and writing the output from it"""
+    partSize = proteinsPerWorkbook(Matcher)
+    if maxProteins is not None:
+        partSize = min(partSize, maxProteins)
+    Spill = SpillFile(outName + " spill", partSize)
+    try:
+        with stage("count") as Counts:
+            ProteinSequences = countedSequences(
+                Counts, timedSequences("read FASTA", prefetchedSequences(Files)))
+            for Record in countedRecords(ProteinSequences, jobs, Matcher=scanMatcher):
+                Spill.append(Record)
+        if not len(Spill):
+            return []
+        return writeSpilledWorkbooks(Spill, outName, formulas, Matcher)
+    finally:
+        Spill.remove()
@@ -0,0 +1,127 @@
+#Protein amino acid composition analysis = Paacman
+#Sliding-window profiles, which show where along each protein residues or motifs cluster.
+
+import numpy #Needs to be installed by the user!
+from collections import namedtuple
+import csv
+
+from paacman.aminoacids import AAIndex
+from paacman.motifs import MotifSet, compileMotifs, motifHits
+
+#Residue classes that a window profile can be named after. A profile can also be named
+#after a motif set (e.g., "Possible Aspartimides") or be a string of amino acids (e.g., DE).
+ResidueClasses = {"hydrophobic": "AILMFVW",
+                  "aromatic": "FWY",
+                  "acidic": "DE",
+                  "basic": "HKR",
+                  "charged": "DEHKR",
+                  "polar": "NQST"}
+
+#Profiles written when no --window-profile is given.
+DefaultWindowProfiles = ["hydrophobic", "Possible Aspartimides", "Possible Pseudoprolines"]
+
+#The window width and the profiles counted in each window. Each profile is a motif set
+#(a residue class is a motif set with one motif, e.g. [AILMFVW]) compiled on its own.
+WindowSettings = namedtuple("WindowSettings", ["Width", "Titles", "Matchers"])
+
+#This turns the names of window profiles into window settings, finding each name among the
+#residue classes and the titles of MotifSets, or else reading it as a string of amino acids.
+def compileWindows(width, ProfileNames, MotifSets):
+    """Function for building the window settings of a set of profile names"""
+    MotifSetsByTitle = dict((Set.Title, Set) for Set in MotifSets)
+    Matchers = []
+    for name in ProfileNames:
+        if name in ResidueClasses:
+            Set = MotifSet(name, ["[" + ResidueClasses[name] + "]"])
+        elif name in MotifSetsByTitle:
+            Set = MotifSetsByTitle[name]
+        elif name and all(letter in AAIndex for letter in name.upper()):
+            Set = MotifSet(name, ["[" + name.upper() + "]"])
+        else:
+            raise ValueError("The window profile " + name + " isn't a residue class (" +
+                             ", ".join(sorted(ResidueClasses)) + "), a motif set or a "
+                             "string of amino acids.")
+        Matchers.append(compileMotifs([Set]))
+    return WindowSettings(width, list(ProfileNames), Matchers)
+
+#This counts the hits of one profile in every window of an encoded protein. The hits
+#starting at each position are added up once into prefix sums, so that each window's count
+#is the difference of 2 prefix sums, however wide the window is. A motif hit is counted in
+#a window when all of it lies within the window. A protein shorter than the window is a
+#single window.
+def profileWindows(EncodedProtein, Matcher, width):
+    """Function for counting the hits of a profile in each window of an encoded protein"""
+    windowTotal = max(len(EncodedProtein) - width + 1, 1)
+    starts = numpy.arange(windowTotal)
+    ends = numpy.minimum(starts + width, len(EncodedProtein))
+    WindowCounts = numpy.zeros(windowTotal, dtype=numpy.int64)
+    for length in Matcher.Lengths:
+        prefixSums = numpy.concatenate(([0], numpy.cumsum(motifHits(EncodedProtein, Matcher,
+                                                                    length))))
+        lastStarts = numpy.maximum(ends - length + 1, starts)
+        WindowCounts += prefixSums[lastStarts] - prefixSums[starts]
+    return WindowCounts
+
+#This counts every profile in every window of an encoded protein, as a windows x profiles
+#array. Counts are saved as 16 bit numbers whenever they can't be larger than 65,535.
+def windowCounts(EncodedProtein, Windows):
+    """Function for building the window profiles of an encoded protein"""
+    WindowCounts = numpy.column_stack([profileWindows(EncodedProtein, Matcher, Windows.Width)
+                                       for Matcher in Windows.Matchers])
+    return WindowCounts.astype(windowCountType(Windows))
+
+#Window counts can't be larger than the window width times the number of motifs.
+def windowCountType(Windows):
+    """Function for choosing the smallest number type that holds every window count"""
+    mostMotifs = max(Matcher.MotifTotal for Matcher in Windows.Matchers)
+    if Windows.Width * mostMotifs <= numpy.iinfo(numpy.uint16).max:
+        return numpy.uint16
+    return numpy.uint32
+
+#This finds the n windows with the most hits that don't overlap each other, as
+#(first residue, last residue, count) with residues numbered from 1. Windows with the same
+#count are taken from the start of the protein first.
+def worstWindows(ProfileCounts, width, proteinLength, n=3):
+    """Function for finding the non-overlapping windows with the most hits of a profile"""
+    Worst = []
+    for start in numpy.argsort(-ProfileCounts.astype(numpy.int64), kind="mergesort"):
+        if len(Worst) == n or ProfileCounts[start] == 0:
+            break
+        if all(abs(start - i[0] + 1) >= width for i in Worst):
+            Worst.append((int(start) + 1, min(int(start) + width, proteinLength),
+                          int(ProfileCounts[start])))
+    return Worst
+
+#This saves the window counts of every protein as an .npz file. The windows of protein i
+#are rows offsets[i] to offsets[i + 1] of counts, whose columns are the profiles, and the
+#window in row r of protein i starts at residue r - offsets[i] + 1.
+def writeWindowArrays(ProteinRecords, Windows, fileName):
+    """Function for saving the window counts of every protein"""
+    offsets = numpy.zeros(len(ProteinRecords) + 1, dtype=numpy.int64)
+    offsets[1:] = numpy.cumsum([len(Record.WindowCounts) for Record in ProteinRecords])
+    numpy.savez(fileName,
+                protein_names=numpy.array([Record.ProteinName for Record in ProteinRecords]),
+                profiles=numpy.array(Windows.Titles), window=numpy.array(Windows.Width),
+                offsets=offsets,
+                counts=numpy.concatenate([numpy.zeros((0, len(Windows.Titles)),
+                                                      dtype=windowCountType(Windows))] +
+                                         [Record.WindowCounts for Record in ProteinRecords]))
+
+#This saves the n worst (most crowded) windows of each profile in each protein as a CSV
+#file, one window per row.
+def writeWorstWindows(ProteinRecords, Windows, n, fileName):
+    """Function for saving the worst windows of each protein as a CSV file"""
+    with open(fileName, "wb") as outFile:
+        writer = csv.writer(outFile)
+        writer.writerow(["Protein Name", "Profile", "Rank", "First Residue", "Last Residue",
+                         "Count"])
+        for Record in ProteinRecords:
+            #A protein shorter than the window is one window, ending at its last residue.
+            proteinLength = Record.ProteinLength
+            if proteinLength is None:
+                proteinLength = len(Record.WindowCounts) + Windows.Width - 1
+            for column, title in enumerate(Windows.Titles):
+                for rank, (first, last, count) in enumerate(
+                        worstWindows(Record.WindowCounts[:, column], Windows.Width,
+                                     proteinLength, n)):
+                    writer.writerow([Record.ProteinName, title, rank + 1, first, last, count])
@@ -0,0 +1,520 @@
+#Protein amino acid composition analysis = Paacman
+#Writing the output Excel file (openpyxl). This module is only imported when an Excel
+#file is written, so that the rest of Paacman can be used without loading openpyxl.
+
+import numpy #Needs to be installed by the user!
+import openpyxl #Needs to be installed by the user!
+from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill
+from openpyxl.styles.borders import Border, Side
+from openpyxl.styles.fonts import DEFAULT_FONT
+from openpyxl.formatting.rule import ColorScaleRule
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
+
+from paacman.aminoacids import AAList
+from paacman.counting import sumCounts, totalRecord
+from paacman.motifs import DefaultMotifMatcher, motifSetColumns, recordMotifCounts
+from paacman.profiling import stage
+
+#Creates colors to fill in Excel cells (openpyxl).
+blackFill = PatternFill(start_color='FF000000',
+                        end_color='FF000000',
+                        fill_type='solid')
+
+redFill = PatternFill(start_color='FFFF0000',
+                       end_color='FFFF0000',
+                       fill_type='solid')
+
+aquaFill = PatternFill(start_color='007FFFD4',
+                       end_color='007FFFD4',
+                       fill_type='solid')
+
+greenFill = PatternFill(start_color='FF00FF00',
+                       end_color='FF00FF00',
+                       fill_type='solid')
+
+heatBlueFill = PatternFill(start_color='FF0000AA',
+                       end_color='FF0000AA',
+                       fill_type='solid')
+
+heatWhiteFill = PatternFill(start_color='FFFFFFFF',
+                       end_color='FFFFFFFF',
+                       fill_type='solid')
+
+heatRedFill = PatternFill(start_color='FFAA0000',
+                       end_color='FFAA0000',
+                       fill_type='solid')
+
+#Setting for a thick border line (openpyxl).
+thick = Side(style='thick')
+
+#Setting for centering a cell (openpyxl).
+center = Alignment(horizontal="center", vertical="center")
+
+#Setting for centering a cell horizontally only (openpyxl).
+centerHorizontal = Alignment(horizontal="center")
+
+#Settings for bold headings (openpyxl).
+headingFont = Font(size=12, bold=True)
+titleFont = Font(size=12, color='FFFFFFFF', bold=True)
+
+#This builds the named cell styles used throughout the output Excel file (openpyxl).
+#Each style is added to the workbook once and then shared by every cell that uses it,
+#instead of every cell building its own font, fill, alignment and border.
+def cellStyles():
+    """Function for building the named cell styles of the output Excel file"""
+    return [
+        NamedStyle(name="Paacman Title", font=titleFont, fill=blackFill, alignment=center),
+        NamedStyle(name="Paacman Name Heading", font=headingFont, alignment=center,
+                   border=Border(right=thick, bottom=thick, top=thick)),
+        NamedStyle(name="Paacman Heading", font=headingFont, alignment=center,
+                   border=Border(bottom=thick)),
+        NamedStyle(name="Paacman Heading Right", font=headingFont, alignment=center,
+                   border=Border(bottom=thick, right=thick)),
+        NamedStyle(name="Paacman Total Heading", font=headingFont, alignment=center,
+                   border=Border(right=thick, bottom=thick, top=thick, left=thick)),
+        NamedStyle(name="Paacman Protein Name", font=headingFont, alignment=center,
+                   border=Border(right=thick)),
+        NamedStyle(name="Paacman Last Protein Name", font=headingFont, alignment=center,
+                   border=Border(right=thick, bottom=thick)),
+        NamedStyle(name="Paacman Count", font=DEFAULT_FONT, alignment=centerHorizontal),
+        NamedStyle(name="Paacman Row Total", font=headingFont, fill=aquaFill,
+                   alignment=center, border=Border(left=thick, right=thick)),
+        NamedStyle(name="Paacman Total Label", font=headingFont, alignment=center,
+                   border=Border(top=thick, right=thick, bottom=thick)),
+        NamedStyle(name="Paacman Column Total", font=headingFont, fill=aquaFill,
+                   alignment=center, border=Border(top=thick, bottom=thick, right=thick)),
+        NamedStyle(name="Paacman Grand Total", font=titleFont, fill=redFill, alignment=center,
+                   border=Border(right=thick, left=thick, top=thick, bottom=thick)),
+        NamedStyle(name="Paacman Percentage Label", font=headingFont, alignment=center,
+                   border=Border(right=thick, bottom=thick)),
+        NamedStyle(name="Paacman Percentage", font=headingFont, fill=greenFill,
+                   alignment=center, border=Border(bottom=thick, right=thick),
+                   number_format='0.00%'),
+        NamedStyle(name="Paacman Heatmap", font=Font(bold=True), alignment=centerHorizontal,
+                   number_format='0.00%'),
+        NamedStyle(name="Paacman Heatmap Right", font=Font(bold=True),
+                   alignment=centerHorizontal, border=Border(right=thick),
+                   number_format='0.00%'),
+        NamedStyle(name="Paacman Heatmap Bottom", font=Font(bold=True),
+                   alignment=centerHorizontal, border=Border(bottom=thick),
+                   number_format='0.00%'),
+        NamedStyle(name="Paacman Heatmap Corner", font=Font(bold=True),
+                   alignment=centerHorizontal, border=Border(right=thick, bottom=thick),
+                   number_format='0.00%'),
+        NamedStyle(name="Paacman Legend Title", font=titleFont, fill=blackFill,
+                   alignment=centerHorizontal),
+        NamedStyle(name="Paacman Legend Heading Left", font=headingFont,
+                   alignment=centerHorizontal,
+                   border=Border(left=thick, right=thick, bottom=thick)),
+        NamedStyle(name="Paacman Legend Heading", font=headingFont, alignment=centerHorizontal,
+                   border=Border(right=thick, bottom=thick)),
+        NamedStyle(name="Paacman Legend Blue", font=DEFAULT_FONT, fill=heatBlueFill,
+                   border=Border(right=thick, left=thick, bottom=thick)),
+        NamedStyle(name="Paacman Legend White", font=DEFAULT_FONT, fill=heatWhiteFill,
+                   border=Border(right=thick, left=thick, bottom=thick)),
+        NamedStyle(name="Paacman Legend Red", font=DEFAULT_FONT, fill=heatRedFill,
+                   border=Border(right=thick, left=thick, bottom=thick)),
+        NamedStyle(name="Paacman Axis Title", font=headingFont, fill=aquaFill,
+                   alignment=center),
+        NamedStyle(name="Paacman Axis Label", font=headingFont, alignment=centerHorizontal,
+                   border=Border(top=thick, bottom=thick, right=thick, left=thick)),
+    ]
+
+#Titles of the 3 sheets in the output Excel file.
+SheetTitles = ["AA Composition", "CPS Di-AA Composition", "Total Di-AA Composition"]
+
+#This creates the output Excel file with the desired 3 sheets. A write-only workbook
+#streams each row to disk as soon as it is written, so its memory use doesn't grow with the
+#number of proteins.
+def createWorkbook(writeOnly=False):
+    """Function for creating the output Excel file and registering its cell styles"""
+    outFile = openpyxl.Workbook(write_only=writeOnly)
+    if not writeOnly:
+        outFile.remove_sheet(outFile.get_sheet_by_name("Sheet")) #Removes empty sheet
+    for style in cellStyles():
+        outFile.add_named_style(style)
+    for title in SheetTitles:
+        outFile.create_sheet(title=title)
+    return outFile
+
+#Excel doesn't allow formulas longer than this many characters.
+ExcelFormulaLimit = 8192
+
+#Excel doesn't allow more rows or columns than this in a sheet. A CPS block takes a column
+#for the protein names and one for the totals, on top of its motifs.
+ExcelRowLimit = 1048576
+ExcelColumnLimit = 16384
+MotifsPerBlock = ExcelColumnLimit - 2
+
+#This calculates a percentage cell, leaving the cell empty instead of dividing by 0 for a
+#protein without any canonical amino acids.
+def percentage(count, total):
+    """Function for dividing a count by a total for the percentage cells"""
+    if total == 0:
+        return None
+    return float(count) / total
+
+#This turns a row of (value, style name) pairs into cells and appends them to a sheet, so
+#that every row is built once and, in write-only mode, streamed straight to disk.
+#None leaves a cell empty.
+def appendRow(sheet, row):
+    """Function for appending a row of (value, style name) pairs to a sheet"""
+    cells = []
+    for entry in row:
+        if entry is None:
+            cells.append(None)
+            continue
+        cell = WriteOnlyCell(sheet, entry[0])
+        cell.style = entry[1]
+        cells.append(cell)
+    sheet.append(cells)
+
+#Write-only sheets can't merge cells, so titles are only merged in regular workbooks.
+def mergeCells(sheet, cellRange):
+    """Function for merging a range of cells, unless the sheet is write-only"""
+    if not sheet.parent.write_only:
+        sheet.merge_cells(cellRange)
+
+#The following is for the single AA Composition portion of Paacman. With formulas=False,
+#the totals, percentages and heat map are written as values calculated by Paacman instead
+#of Excel formulas, so that the workbook opens without recalculating anything.
+def writeAACompositionSheet(sheet, ProteinRecords, formulas=True):
+    """Function for writing the AA Composition sheet and its heat map"""
+    #Skips the first column since Protein Name is written there.
+    letterList = [get_column_letter(i) for i in range(2, len(AAList) + 3)]
+    lastAALetter = letterList[len(AAList) - 1]
+    totalLetter = letterList[len(AAList)]
+    
+    #Writes initial information into the AA Composition sheet.
+    appendRow(sheet, [None, ("Amino Acids", "Paacman Title")])
+    mergeCells(sheet, "B1:" + lastAALetter + "1")
+    
+    #This writes the amino acid single letter codes at the top of each column, followed by
+    #the "Total" heading for the last column.
+    appendRow(sheet, [("Protein Name", "Paacman Name Heading")] +
+                     [(i, "Paacman Heading") for i in AAList] +
+                     [("Total", "Paacman Total Heading")])
+    
+    #Types AA counts for each protein into approp. cells in spreadsheet, followed by the
+    #total number of amino acids in the protein.
+    rowTracker = 3
+    firstDataRow = 3 #Important for AA percentage table and heat map
+    for Record in ProteinRecords:
+        if formulas:
+            rowTotal = ("=SUM(" + letterList[0] + str(rowTracker) + ":" +
+                        lastAALetter + str(rowTracker) + ")")
+        else:
+            rowTotal = int(Record.AACounts.sum())
+        appendRow(sheet, [(Record.ProteinName, "Paacman Protein Name")] +
+                         [(i, "Paacman Count") for i in Record.AACounts.tolist()] +
+                         [(rowTotal, "Paacman Row Total")])
+        rowTracker += 1
+    lastDataRow = rowTracker #Important for AA percentage table and heat map
+    AATotals = sumCounts((Record.AACounts for Record in ProteinRecords), len(AAList)).tolist()
+    
+    #Puts total AA count for each residue into the Excel sheet. The total AA count for the
+    #entire list of proteins gets special formatting.
+    totalRow = [("Total", "Paacman Total Label")]
+    if formulas:
+        for letter in letterList[:len(AAList)]:
+            totalRow.append(("=SUM(" + letter + str(firstDataRow) + ":" + letter +
+                             str(rowTracker - 1) + ")", "Paacman Column Total"))
+        totalRow.append(("=SUM(" + totalLetter + str(firstDataRow) + ":" + totalLetter +
+                         str(rowTracker - 1) + ")", "Paacman Grand Total"))
+    else:
+        totalRow += [(i, "Paacman Column Total") for i in AATotals]
+        totalRow.append((sum(AATotals), "Paacman Grand Total"))
+    finalTotalCell = totalLetter + str(rowTracker)
+    appendRow(sheet, totalRow)
+    rowTracker += 1
+    
+    #Enters percentage formulas (or values) into each cell in the 'Percentage' row.
+    if formulas:
+        percentageRow = [("=" + letter + str(rowTracker - 1) + "/" + finalTotalCell,
+                          "Paacman Percentage") for letter in letterList[:len(AAList)]]
+    else:
+        percentageRow = [(percentage(i, sum(AATotals)), "Paacman Percentage")
+                         for i in AATotals]
+    appendRow(sheet, [("Percentage", "Paacman Percentage Label")] + percentageRow)
+    
+    #The following codes for the AA Composition heat map.
+    #Writes the initial heat map information into the sheet.
+    rowTracker +=2 #Puts a row space between the heat map and total amino acid info.
+    appendRow(sheet, [])
+    appendRow(sheet, [None, ("Amino Acid Percentage Heatmap", "Paacman Title")])
+    mergeCells(sheet, "B" + str(rowTracker) + ":" + lastAALetter + str(rowTracker))
+    
+    #Writes single letter amino acid codes into the top of the heat map.
+    rowTracker +=1
+    appendRow(sheet, [("Protein Name", "Paacman Name Heading")] +
+                     [(i, "Paacman Heading") for i in AAList[:-1]] +
+                     [(AAList[-1], "Paacman Heading Right")])
+    
+    #This saves the first row of the actual heat map, which helps write the heat map legend.
+    rowTracker +=1
+    firstPercentageCell = 'B' + str(rowTracker)
+    firstPercentageRow = rowTracker
+    
+    #The heat map key is written to the right of the first rows of the heat map.
+    LegendRows = [[("Heatmap Legend", "Paacman Legend Title")],
+                  [("Color", "Paacman Legend Heading Left"), ("%", "Paacman Legend Heading")],
+                  [(None, "Paacman Legend Blue"), ("0.00%", "Paacman Legend Heading")],
+                  [(None, "Paacman Legend White"), ("5.00%", "Paacman Legend Heading")],
+                  [(None, "Paacman Legend Red"), ("10.00%", "Paacman Legend Heading")]]
+    
+    #This loop writes the amino acid percentages (# of AA divided by total # of residues in
+    #a protein) into the heat map. The last row and column get a border.
+    for i in range(max(lastDataRow - firstDataRow, len(LegendRows))):
+        dataRow = firstDataRow + i
+        if dataRow < lastDataRow:
+            Record = ProteinRecords[i]
+            lastRow = dataRow == lastDataRow - 1
+            if formulas:
+                row = [('=A' + str(dataRow),
+                        "Paacman Last Protein Name" if lastRow else "Paacman Protein Name")]
+            else:
+                row = [(Record.ProteinName,
+                        "Paacman Last Protein Name" if lastRow else "Paacman Protein Name")]
+            AACounts = Record.AACounts.tolist()
+            for AAEntryCount, letter in enumerate(letterList[:len(AAList)]):
+                if letter == lastAALetter:
+                    style = "Paacman Heatmap Corner" if lastRow else "Paacman Heatmap Right"
+                else:
+                    style = "Paacman Heatmap Bottom" if lastRow else "Paacman Heatmap"
+                if formulas:
+                    value = "=" + letter + str(dataRow) + "/" + totalLetter + str(dataRow)
+                else:
+                    value = percentage(AACounts[AAEntryCount], sum(AACounts))
+                row.append((value, style))
+        else:
+            row = [None] * (len(AAList) + 1)
+        if i < len(LegendRows):
+            row += [None] + LegendRows[i]
+        appendRow(sheet, row)
+    
+    #This saves the last cell of the heat map (important for conditional formatting).
+    lastPercentageCell = lastAALetter + str(lastDataRow - firstDataRow + firstPercentageRow - 1)
+    
+    #Setting for Conditional Formatting used in the AA heat map.
+    sheet.conditional_formatting.add(firstPercentageCell + ":" + lastPercentageCell,
+                                     ColorScaleRule(start_type='num', start_value=0, start_color='FF0000AA',
+                                     mid_type='num', mid_value=0.05, mid_color='FFFFFFFF',
+                                     end_type='num', end_value=0.10, end_color='FFAA0000')
+                                     )
+    mergeCells(sheet, "W" + str(firstPercentageRow) + ":X" + str(firstPercentageRow))
+
+#This writes one block of motif counts (e.g., Cys ligation sites) into the CPS Di-AA sheet
+#and returns the row after the block's "Total" row. The block's motifs are the motif
+#columns of Matcher starting at firstColumn.
+def writeCPSBlock(sheet, ProteinRecords, rowTracker, title, Motifs, formulas=True,
+                  Matcher=DefaultMotifMatcher, firstColumn=0):
+    """Function for writing a titled block of motif counts into the CPS Di-AA sheet"""
+    firstLetter = get_column_letter(2)
+    lastLetter = get_column_letter(len(Motifs) + 1)
+    totalLetter = get_column_letter(len(Motifs) + 2)
+    
+    #Writes initial block information into the CPS Di-AA sheet.
+    appendRow(sheet, [None, (title, "Paacman Title")])
+    mergeCells(sheet, firstLetter + str(rowTracker) + ":" + lastLetter + str(rowTracker))
+    rowTracker += 1
+    
+    #Writes the motifs into the top of the columns, followed by the "Total" heading for the
+    #last column.
+    appendRow(sheet, [("Protein Name", "Paacman Name Heading")] +
+                     [(i, "Paacman Heading") for i in Motifs] +
+                     [("Total", "Paacman Total Heading")])
+    
+    #Types motif counts for each protein into approp. cells in the sheet, followed by the
+    #total number of motifs found within the protein.
+    rowTracker +=1
+    firstBlockRow = rowTracker #Important for finding the block totals later on.
+    BlockTotals = numpy.zeros(len(Motifs), dtype=numpy.int64)
+    for Record in ProteinRecords:
+        BlockCounts = recordMotifCounts(Record, Matcher)[firstColumn:firstColumn + len(Motifs)]
+        BlockTotals += BlockCounts
+        if formulas:
+            rowTotal = ("=SUM(" + firstLetter + str(rowTracker) + ":" + 
+                        lastLetter + str(rowTracker) + ")")
+        else:
+            rowTotal = int(BlockCounts.sum())
+        appendRow(sheet, [(Record.ProteinName, "Paacman Protein Name")] +
+                         [(i, "Paacman Count") for i in BlockCounts.tolist()] +
+                         [(rowTotal, "Paacman Row Total")])
+        rowTracker += 1
+        
+    #Puts total count for each motif into the sheet.
+    totalRow = [("Total", "Paacman Total Label")]
+    if formulas:
+        for i in range(2, len(Motifs) + 3):
+            letter = get_column_letter(i)
+            totalRow.append(("=SUM(" + letter + str(firstBlockRow) + ":" + 
+                             letter + str(rowTracker - 1) + ")", "Paacman Column Total"))
+    else:
+        totalRow += [(i, "Paacman Column Total") for i in BlockTotals.tolist()]
+        totalRow.append((int(BlockTotals.sum()), "Paacman Column Total"))
+    appendRow(sheet, totalRow)
+    return rowTracker + 1
+
+#The following is for the complete protein synthesis (CPS) di-peptides in Paacman. Each
+#motif set of Matcher (by default Cys and Ala ligation sites, aspartimides and
+#pseudoprolines) is written as its own block. A set with more motifs than fit across an
+#Excel sheet is written as several blocks, one under the other.
+def writeCPSSheet(sheet, ProteinRecords, formulas=True, Matcher=DefaultMotifMatcher):
+    """Function for writing the CPS Di-AA Composition sheet"""
+    rowTracker = 1
+    for i, (Set, (firstColumn, lastColumn)) in enumerate(zip(Matcher.MotifSets,
+                                                            motifSetColumns(Matcher))):
+        with stage("write CPS block: " + Set.Title, len(ProteinRecords)):
+            blockStarts = range(0, len(Set.Motifs), MotifsPerBlock)
+            for blockNum, blockStart in enumerate(blockStarts):
+                if i > 0 or blockNum > 0:
+                    appendRow(sheet, []) #Skips a space before the next block.
+                    rowTracker += 1
+                title = Set.Title
+                if len(blockStarts) > 1:
+                    title += " (" + str(blockNum + 1) + " of " + str(len(blockStarts)) + ")"
+                rowTracker = writeCPSBlock(sheet, ProteinRecords, rowTracker, title,
+                                           Set.Motifs[blockStart:blockStart + MotifsPerBlock],
+                                           formulas, Matcher, firstColumn + blockStart)
+
+#This writes a single di-AA box (title, '1st Amino Acid' and '2nd Amino Acid' headings and
+#the 20x20 di-AA counts) starting at rowNum. Each row of the box is one 2nd amino acid, so
+#the box is written from the columns of the di-AA matrix.
+def writeDiAABox(sheet, rowNum, title, DiAARows):
+    """Function for writing a 20x20 di-AA box into the Total Di-AA sheet"""
+    firstLetter = get_column_letter(3)
+    lastLetter = get_column_letter(len(AAList) + 2)
+    
+    #Writes the title and the '1st Amino Acid' heading at the top of the di-AA box.
+    appendRow(sheet, [None, None, (title, "Paacman Title")])
+    mergeCells(sheet, firstLetter + str(rowNum) + ":" + lastLetter + str(rowNum))
+    appendRow(sheet, [None, None, ("1st Amino Acid", "Paacman Axis Title")])
+    mergeCells(sheet, firstLetter + str(rowNum + 1) + ":" + lastLetter + str(rowNum + 1))
+    
+    #Writes each amino acid underneath the '1st Amino Acid' heading.
+    appendRow(sheet, [None, None] + [(i, "Paacman Axis Label") for i in AAList])
+    
+    #Writes the '2nd Amino Acid' heading and each amino acid next to it, followed by the
+    #di-AA counts for that 2nd amino acid.
+    for i in range(len(AAList)):
+        if i == 0:
+            row = [("2nd Amino Acid", "Paacman Axis Title")]
+        else:
+            row = [None]
+        row.append((AAList[i], "Paacman Axis Label"))
+        row += [(j, "Paacman Count") for j in DiAARows[i]]
+        appendRow(sheet, row)
+    mergeCells(sheet, "A" + str(rowNum + 3) + ":A" + str(rowNum + len(AAList) + 2))
+
+#The following codes for writing the total Di-AA composition sheet.
+def writeTotalDiAASheet(sheet, ProteinRecords, formulas=True):
+    """Function for writing the Total Di-AA Composition sheet"""
+    #This loop writes the total Di-AA compositions for each protein into the sheet and
+    #skips a row after each di-AA box.
+    entryTracker = 0
+    rowNum = 1
+    for Record in ProteinRecords:
+        writeDiAABox(sheet, rowNum, Record.ProteinName, Record.DiPeptideMatrix.T.tolist())
+        appendRow(sheet, [])
+        rowNum += 24
+        entryTracker += 1
+    
+    #The following calculates the total of each di-AA sequence found for the entire set of
+    #proteins and writes it into the total di-AA box at the bottom of the sheet. Each total
+    #is written as a value when formulas are turned off, or when its formula (one cell
+    #reference per protein) would be longer than Excel allows.
+    DiAATotals = sumCounts((Record.DiPeptideMatrix for Record in ProteinRecords),
+                           (len(AAList), len(AAList))).T.tolist()
+    if formulas:
+        lastLetter = get_column_letter(len(AAList) + 2)
+        formulas = (len("=SUM(") + 1 + entryTracker * len("," + lastLetter + str(rowNum))
+                    <= ExcelFormulaLimit)
+    DiAARows = DiAATotals
+    if formulas:
+        DiAARows = []
+        for rowTracker in range(rowNum + 3, rowNum + len(AAList) + 3):
+            DiAARow = []
+            for columnNum in range(3, len(AAList) + 3):
+                letter = get_column_letter(columnNum)
+                Entry = ""
+                for i in range(1,entryTracker+1):
+                    Entry = Entry+","+letter+str((rowTracker-(i*24)))
+                DiAARow.append("=SUM("+Entry+")")
+            DiAARows.append(DiAARow)
+    writeDiAABox(sheet, rowNum, "Total Di-Amino Acid Counts", DiAARows)
+
+#This creates the output Excel file, renders each sheet from the protein records and saves
+#it as outName.xlsx. The CPS Di-AA sheet holds the motif sets of Matcher.
+def writeWorkbook(ProteinRecords, outName, writeOnly=False, formulas=True,
+                  Matcher=DefaultMotifMatcher):
+    """Function for writing the protein records into the output Excel file"""
+    outFile = createWorkbook(writeOnly)
+    with stage("write AA Composition sheet", len(ProteinRecords)):
+        writeAACompositionSheet(outFile.worksheets[0], ProteinRecords, formulas)
+    writeCPSSheet(outFile.worksheets[1], ProteinRecords, formulas, Matcher)
+    with stage("write Total Di-AA Composition sheet", len(ProteinRecords)):
+        writeTotalDiAASheet(outFile.worksheets[2], ProteinRecords, formulas)
+    with stage("save xlsx"):
+        outFile.save(outName + ".xlsx")
+
+#This finds the most proteins that fit into one output Excel file. The AA Composition sheet
+#takes 2 rows per protein (counts and heat map) plus 7, each CPS block 1 row per protein
+#plus 4 (title, headings, totals and the space before the next block), and the Total Di-AA
+#sheet 24 rows per protein plus 23 for the total di-AA box.
+def proteinsPerWorkbook(Matcher=DefaultMotifMatcher):
+    """Function for finding how many proteins fit within Excel's row limit"""
+    blocks = sum(len(range(0, len(Set.Motifs), MotifsPerBlock)) for Set in Matcher.MotifSets)
+    return min((ExcelRowLimit - 7) // 2, (ExcelRowLimit + 1) // blocks - 4,
+               (ExcelRowLimit - 23) // 24)
+
+#This names the totals of a part of the output Excel file in the summary workbook.
+def partTitle(partNum, first, proteins):
+    """Function for naming the summary row of a part of the output Excel file"""
+    return ("Part " + str(partNum) + " (proteins " + str(first + 1) + "-" +
+            str(first + proteins) + ")")
+
+#This allows writeWorkbook() to be handed out to a pool of processes, which pass the
+#arguments of each part of the output as a single tuple.
+def writeWorkbookPart(Arguments):
+    """Function for writing one part of the output Excel file"""
+    writeWorkbook(*Arguments)
+
+#This writes the output Excel file, or, when there are more proteins than Excel allows in a
+#sheet (or than maxProteins), splits the proteins into parts saved as "outName part 1.xlsx",
+#"outName part 2.xlsx" and so on, along with "outName summary.xlsx", which holds the totals
+#of each part (as one totalled record per part) and the grand totals of every protein. With
+#more than 1 job, the parts are written by a pool of processes.
+def writeWorkbooks(ProteinRecords, outName, writeOnly=False, formulas=True,
+                   Matcher=DefaultMotifMatcher, jobs=1, maxProteins=None):
+    """Function for writing the protein records into one or more output Excel files"""
+    partSize = proteinsPerWorkbook(Matcher)
+    if maxProteins is not None:
+        partSize = min(partSize, maxProteins)
+    if len(ProteinRecords) <= partSize:
+        writeWorkbook(ProteinRecords, outName, writeOnly, formulas, Matcher)
+        return [outName + ".xlsx"]
+    
+    Parts = []
+    SummaryRecords = []
+    for partNum, first in enumerate(range(0, len(ProteinRecords), partSize)):
+        PartRecords = ProteinRecords[first:first + partSize]
+        partName = outName + " part " + str(partNum + 1)
+        Parts.append((PartRecords, partName, writeOnly, formulas, Matcher))
+        SummaryRecords.append(totalRecord(partTitle(partNum + 1, first, len(PartRecords)),
+                                          PartRecords))
+    with stage("write xlsx parts", len(ProteinRecords)):
+        if jobs > 1:
+            import multiprocessing #Only needed when writing with more than 1 process.
+            pool = multiprocessing.Pool(min(jobs, len(Parts)))
+            try:
+                pool.map(writeWorkbookPart, Parts, chunksize=1)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            for Part in Parts:
+                writeWorkbookPart(Part)
+    with stage("write xlsx summary", len(ProteinRecords)):
+        writeWorkbook(SummaryRecords, outName + " summary", writeOnly, formulas, Matcher)
+    return [Part[1] + ".xlsx" for Part in Parts] + [outName + " summary.xlsx"]